@@ -2,6 +2,7 @@ from .config import (
     ApprovalPolicy,
     BridgewardenConfig,
     ConfigError,
+    FilePolicy,
     NetworkPolicy,
     POLICY_VERSION,
     load_config,
@@ -25,6 +26,7 @@ __all__ = [
     "BridgewardenContext",
     "BridgewardenServer",
     "ConfigError",
+    "FilePolicy",
     "NetworkPolicy",
     "HttpClient",
     "NetworkError",
@@ -1,11 +1,17 @@
 """Source approval storage for web and repo access."""
 
+from collections import OrderedDict
 import json
+import os
+import threading
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+_FILE_CACHE_MAX_ENTRIES = 1024
+_StatKey = Tuple[int, int, int, int]
 
 
 @dataclass(frozen=True)
@@ -31,22 +37,121 @@ class SourceApprovalStatus:
     decided_by: Optional[str] = None
     notes: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        """Return a shallow dict of the record; every field is already JSON-safe."""
+
+        return {field.name: getattr(self, field.name) for field in fields(self)}
+
+
+class FileApprovalBackend:
+    """Store approval records as one JSON file per approval id."""
+
+    def __init__(self, root: Path) -> None:
+        """Initialize the backend and create its directory."""
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Parsed records keyed by file name, tagged with the stat they were read at.
+        self._cache: "OrderedDict[str, Tuple[_StatKey, SourceApprovalStatus]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def get(self, approval_id: str) -> SourceApprovalStatus:
+        """Load one record; raises FileNotFoundError for unknown ids."""
+
+        return self._load(self.root / f"{approval_id}.json")
+
+    def put(self, status: SourceApprovalStatus) -> None:
+        """Persist a record, replacing any earlier version."""
+
+        data = json.dumps(status.to_dict(), sort_keys=True)
+        path = self.root / f"{status.approval_id}.json"
+        # Replace rather than rewrite so every version gets a fresh inode in the stat key.
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(data, encoding="utf-8")
+        os.replace(tmp_path, path)
+        self._remember(path.name, _stat_key(path), status)
+
+    def iter_all(self) -> Iterator[SourceApprovalStatus]:
+        """Yield every record in file name order."""
+
+        for path in sorted(self.root.glob("*.json")):
+            yield self._load(path)
+
+    def _load(self, path: Path) -> SourceApprovalStatus:
+        """Return a record, re-reading it only when the file changed on disk."""
+
+        key = _stat_key(path)
+        with self._cache_lock:
+            cached = self._cache.get(path.name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        status = SourceApprovalStatus(**json.loads(path.read_text(encoding="utf-8")))
+        self._remember(path.name, key, status)
+        return status
+
+    def _remember(self, name: str, key: _StatKey, status: SourceApprovalStatus) -> None:
+        """Cache a parsed record, evicting the least recently stored entries."""
+
+        with self._cache_lock:
+            self._cache[name] = (key, status)
+            self._cache.move_to_end(name)
+            while len(self._cache) > _FILE_CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+
+def _stat_key(path: Path) -> _StatKey:
+    """Identify a file version by inode, change and modification time, and size."""
+
+    stat = path.stat()
+    return stat.st_ino, stat.st_ctime_ns, stat.st_mtime_ns, stat.st_size
+
+
+class InMemoryApprovalBackend:
+    """Keep approval records in a dict, for tests and throwaway sessions."""
+
+    def __init__(self) -> None:
+        """Initialize an empty record map."""
+
+        self._records: Dict[str, SourceApprovalStatus] = {}
+
+    def get(self, approval_id: str) -> SourceApprovalStatus:
+        """Return one record; raises FileNotFoundError for unknown ids, like the file backend."""
+
+        try:
+            return self._records[approval_id]
+        except KeyError:
+            raise FileNotFoundError(f"unknown approval id: {approval_id}") from None
+
+    def put(self, status: SourceApprovalStatus) -> None:
+        """Store a record, replacing any earlier version."""
+
+        self._records[status.approval_id] = status
+
+    def iter_all(self) -> Iterator[SourceApprovalStatus]:
+        """Yield every record in approval id order."""
+
+        for approval_id in sorted(self._records):
+            yield self._records[approval_id]
+
 
 class SourceApprovalStore:
-    """File-backed store for approval requests and decisions."""
+    """Store for approval requests and decisions, file-backed by default."""
 
     def __init__(
         self,
-        root: Path,
+        root: Optional[Path] = None,
         id_factory: Optional[Callable[[], str]] = None,
         clock: Optional[Callable[[], str]] = None,
+        backend: Optional[Union[FileApprovalBackend, InMemoryApprovalBackend]] = None,
     ) -> None:
-        """Initialize the approvals store and helpers."""
+        """Initialize the approvals store on a root directory or an explicit backend."""
 
-        self.root = Path(root)
+        if root is None and backend is None:
+            raise ValueError("SourceApprovalStore requires a root or a backend")
+        self.root = Path(root) if root is not None else None
+        self._backend = backend or FileApprovalBackend(self.root)
         self._id_factory = id_factory or (lambda: f"a_{uuid.uuid4().hex}")
         self._clock = clock or (lambda: datetime.now(timezone.utc).isoformat())
-        self.root.mkdir(parents=True, exist_ok=True)
 
     def request(self, request: SourceApprovalRequest) -> SourceApprovalStatus:
         """Create a new pending approval request."""
@@ -68,8 +173,7 @@ class SourceApprovalStore:
     def get(self, approval_id: str) -> SourceApprovalStatus:
         """Fetch a single approval record by id."""
 
-        data = json.loads((self.root / f"{approval_id}.json").read_text(encoding="utf-8"))
-        return SourceApprovalStatus(**data)
+        return self._backend.get(approval_id)
 
     def list(
         self, status: Optional[str] = None, kind: Optional[str] = None, limit: int = 100
@@ -77,13 +181,12 @@ class SourceApprovalStore:
         """List approvals with optional filters."""
 
         approvals: List[SourceApprovalStatus] = []
-        for path in sorted(self.root.glob("*.json")):
-            data = json.loads(path.read_text(encoding="utf-8"))
-            if status and data.get("status") != status:
+        for approval in self._backend.iter_all():
+            if status and approval.status != status:
                 continue
-            if kind and data.get("kind") != kind:
+            if kind and approval.kind != kind:
                 continue
-            approvals.append(SourceApprovalStatus(**data))
+            approvals.append(approval)
             if len(approvals) >= limit:
                 break
         return approvals
@@ -114,6 +217,23 @@ class SourceApprovalStore:
         self._write(updated)
         return updated
 
+    def seed_approved(
+        self, kind: str, target: str, approval_id: Optional[str] = None
+    ) -> SourceApprovalStatus:
+        """Record a source as approved without a pending request, e.g. for fixtures."""
+
+        timestamp = self._clock()
+        status = SourceApprovalStatus(
+            approval_id=approval_id or self._id_factory(),
+            kind=kind,
+            target=target,
+            status="APPROVED",
+            created_at=timestamp,
+            decided_at=timestamp,
+        )
+        self._write(status)
+        return status
+
     def is_approved(self, kind: str, target: str) -> bool:
         """Check if a specific target has an approved record."""
 
@@ -123,7 +243,6 @@ class SourceApprovalStore:
         return False
 
     def _write(self, status: SourceApprovalStatus) -> None:
-        """Persist an approval record to disk."""
+        """Persist an approval record through the backend."""
 
-        data = json.dumps(status.__dict__, sort_keys=True)
-        (self.root / f"{status.approval_id}.json").write_text(data, encoding="utf-8")
+        self._backend.put(status)
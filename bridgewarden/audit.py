@@ -1,13 +1,16 @@
 """Audit event creation and JSONL logging."""
 
 import json
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 from .types import GuardResult
 
+_AUDIT_ENCODER = json.JSONEncoder(sort_keys=True, ensure_ascii=True)
+
 
 @dataclass(frozen=True)
 class AuditEvent:
@@ -48,22 +51,39 @@ def build_audit_event(result: GuardResult, timestamp: Optional[str] = None) -> A
 def audit_event_to_json(event: AuditEvent) -> str:
     """Serialize an audit event to a JSON string."""
 
-    return json.dumps(event.__dict__, sort_keys=True, ensure_ascii=True)
+    return _AUDIT_ENCODER.encode(event.__dict__)
 
 
 class AuditLogger:
     """Append-only JSONL audit log writer."""
 
-    def __init__(self, path: Path) -> None:
-        """Initialize a logger that appends to the given path."""
-
-        self.path = Path(path)
-        self.path.parent.mkdir(parents=True, exist_ok=True)
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        writer: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Initialize a logger that appends to a path or hands lines to a writer."""
+
+        if path is None and writer is None:
+            raise ValueError("AuditLogger requires a path or a writer")
+        self.path = Path(path) if path is not None else None
+        if writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            writer = self._append_line
+        self._writer = writer
+        # Serializes appends so concurrent tool calls never interleave lines.
+        self._lock = threading.Lock()
 
     def log(self, result: GuardResult, timestamp: Optional[str] = None) -> None:
         """Append a GuardResult to the JSONL audit log."""
 
         event = build_audit_event(result, timestamp=timestamp)
-        payload = audit_event_to_json(event)
+        line = audit_event_to_json(event) + "\n"
+        with self._lock:
+            self._writer(line)
+
+    def _append_line(self, line: str) -> None:
+        """Append a single JSONL line to the log file."""
+
         with self.path.open("a", encoding="utf-8") as handle:
-            handle.write(payload + "\n")
+            handle.write(line)
@@ -1,9 +1,10 @@
 """Configuration parsing and defaults for BridgeWarden."""
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 import json
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, FrozenSet, Iterable, List, Optional
 
 POLICY_VERSION = "0.1.0-dev"
 DEFAULT_PROFILE = "balanced"
@@ -15,6 +16,19 @@ class ConfigError(ValueError):
     pass
 
 
+@lru_cache(maxsize=256)
+def normalize_host(host: str) -> str:
+    """Normalize a hostname for comparisons."""
+
+    return host.strip().lower().rstrip(".")
+
+
+def _normalized_hosts(hosts: Iterable[str]) -> FrozenSet[str]:
+    """Normalize an allowlist into a frozenset for O(1) lookups."""
+
+    return frozenset(normalize_host(host) for host in hosts)
+
+
 @dataclass(frozen=True)
 class ApprovalPolicy:
     """Policy settings for source approvals."""
@@ -22,6 +36,14 @@ class ApprovalPolicy:
     require_approval: bool = True
     allowed_web_domains: List[str] = field(default_factory=list)
     allowed_repo_urls: List[str] = field(default_factory=list)
+    _normalized_web_domains: FrozenSet[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Precompute normalized allowlists used on every fetch."""
+
+        object.__setattr__(
+            self, "_normalized_web_domains", _normalized_hosts(self.allowed_web_domains)
+        )
 
 
 @dataclass(frozen=True)
@@ -37,6 +59,23 @@ class NetworkPolicy:
     repo_max_files: int = 2000
     allowed_web_hosts: List[str] = field(default_factory=list)
     allowed_repo_hosts: List[str] = field(default_factory=list)
+    _normalized_web_hosts: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    _normalized_repo_hosts: FrozenSet[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Precompute normalized host allowlists used on every fetch."""
+
+        object.__setattr__(self, "_normalized_web_hosts", _normalized_hosts(self.allowed_web_hosts))
+        object.__setattr__(
+            self, "_normalized_repo_hosts", _normalized_hosts(self.allowed_repo_hosts)
+        )
+
+
+@dataclass(frozen=True)
+class FilePolicy:
+    """Resource limits for local file reads."""
+
+    max_bytes: int = 1024 * 1024
 
 
 @dataclass(frozen=True)
@@ -46,19 +85,30 @@ class BridgewardenConfig:
     profile: str = DEFAULT_PROFILE
     approval_policy: ApprovalPolicy = field(default_factory=ApprovalPolicy)
     network: NetworkPolicy = field(default_factory=NetworkPolicy)
+    files: FilePolicy = field(default_factory=FilePolicy)
 
 
 DEFAULT_CONFIG = BridgewardenConfig()
 
 
-def load_config(path: Path) -> BridgewardenConfig:
+def _read_config_text(path: Path) -> str:
+    """Read a config file as UTF-8 text."""
+
+    return path.read_text(encoding="utf-8")
+
+
+def load_config(
+    path: Path, reader: Optional[Callable[[Path], str]] = None
+) -> BridgewardenConfig:
     """Load configuration from a JSON-compatible YAML file path."""
 
-    if not path.exists():
+    try:
+        text = (reader or _read_config_text)(path)
+    except (FileNotFoundError, NotADirectoryError):
         return DEFAULT_CONFIG
 
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(text)
     except json.JSONDecodeError as exc:
         raise ConfigError("config must be JSON-compatible YAML") from exc
     if not isinstance(data, dict):
@@ -110,6 +160,13 @@ def config_from_dict(data: dict) -> BridgewardenConfig:
     allowed_web_hosts = _as_string_list(network.get("allowed_web_hosts"))
     allowed_repo_hosts = _as_string_list(network.get("allowed_repo_hosts"))
 
+    files = data.get("files", {})
+    if files is None:
+        files = {}
+    if not isinstance(files, dict):
+        raise ConfigError("files must be an object")
+    file_max_bytes = _as_int(files.get("max_bytes", 1024 * 1024), "files.max_bytes")
+
     return BridgewardenConfig(
         profile=profile,
         approval_policy=ApprovalPolicy(
@@ -128,6 +185,7 @@ def config_from_dict(data: dict) -> BridgewardenConfig:
             allowed_web_hosts=allowed_web_hosts,
             allowed_repo_hosts=allowed_repo_hosts,
         ),
+        files=FilePolicy(max_bytes=file_max_bytes),
     )
 
 
@@ -1,7 +1,8 @@
 """Risk scoring and policy decision logic."""
 
 from dataclasses import dataclass
-from typing import Iterable, Set, Tuple
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Set, Tuple
 
 BLOCK_REASONS = {"PROCESS_SABOTAGE", "CODE_TAMPERING_COERCION"}
 
@@ -74,11 +75,18 @@ def score_reasons(reasons: Iterable[str]) -> float:
     return round(min(1.0, score), 2)
 
 
+@lru_cache(maxsize=256)
+def _score_reason_set(reasons: FrozenSet[str]) -> float:
+    """Score a deduplicated reason set; guarded texts repeat a small number of them."""
+
+    return score_reasons(reasons)
+
+
 def decide(reasons: Iterable[str], profile: PolicyProfile) -> Tuple[str, float]:
     """Return the decision and risk score for a set of reasons."""
 
-    reasons_set = set(reasons)
-    risk_score = score_reasons(reasons_set)
+    reasons_set = frozenset(reasons)
+    risk_score = _score_reason_set(reasons_set)
     if reasons_set & profile.block_reasons:
         return "BLOCK", risk_score
     if risk_score >= profile.block_threshold:
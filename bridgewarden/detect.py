@@ -1,8 +1,9 @@
 """Heuristic detectors for instruction-like content."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 import re
-from typing import Dict, Iterable, List, Pattern
+from typing import Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
 
 from .language_packs import CORE_LANGUAGE_PHRASES, EXTENDED_LANGUAGE_PHRASES
 
@@ -395,6 +396,54 @@ def _active_rules(
     ]
 
 
+@dataclass(frozen=True)
+class _ProfileRules:
+    """Detection rules and collapsed patterns enabled for one profile."""
+
+    rules: Tuple[DetectionRule, ...]
+    obfuscated: Tuple[Tuple[str, str], ...]
+    core_language_rules: Tuple[Tuple[str, Tuple[DetectionRule, ...]], ...]
+    obfuscated_core_language: Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...]
+    extended_language_rules: Dict[str, Tuple[DetectionRule, ...]]
+    obfuscated_extended_language: Dict[str, Tuple[Tuple[str, str], ...]]
+
+
+def _allowed_patterns(
+    profile_name: str, patterns: Iterable[Tuple[str, str]]
+) -> Tuple[Tuple[str, str], ...]:
+    """Filter collapsed (pattern, code) pairs to those the profile enables."""
+
+    return tuple(
+        (pattern, code) for pattern, code in patterns if _profile_allows_reason(profile_name, code)
+    )
+
+
+@lru_cache(maxsize=None)
+def _profile_rules(profile_name: str) -> _ProfileRules:
+    """Build the active rule set for a profile once and reuse it."""
+
+    return _ProfileRules(
+        rules=tuple(_active_rules(profile_name, _DETECTION_RULES)),
+        obfuscated=_allowed_patterns(profile_name, _OBFUSCATED_PATTERNS),
+        core_language_rules=tuple(
+            (language, tuple(_active_rules(profile_name, rules)))
+            for language, rules in _CORE_LANGUAGE_RULES.items()
+        ),
+        obfuscated_core_language=tuple(
+            (language, _allowed_patterns(profile_name, patterns))
+            for language, patterns in _OBFUSCATED_CORE_LANGUAGE_PATTERNS.items()
+        ),
+        extended_language_rules={
+            language: tuple(_active_rules(profile_name, rules))
+            for language, rules in _EXTENDED_LANGUAGE_RULES.items()
+        },
+        obfuscated_extended_language={
+            language: _allowed_patterns(profile_name, patterns)
+            for language, patterns in _OBFUSCATED_EXTENDED_LANGUAGE_PATTERNS.items()
+        },
+    )
+
+
 def detect_reasons(
     text: str,
     unicode_suspicious: bool = False,
@@ -402,45 +451,60 @@ def detect_reasons(
 ) -> List[str]:
     """Return reason codes for detected instruction-like patterns."""
 
+    return _detect_with(_profile_rules(_normalize_profile(profile_name)), text, unicode_suspicious)
+
+
+def detect_reasons_many(
+    texts: Sequence[str],
+    unicode_flags: Optional[Sequence[bool]] = None,
+    profile_name: str = "strict",
+) -> List[List[str]]:
+    """Return reason codes per text, taking each text's normalize_text unicode flag."""
+
+    if unicode_flags is None:
+        unicode_flags = [False] * len(texts)
+    elif len(unicode_flags) != len(texts):
+        raise ValueError("unicode_flags must have one entry per text")
+    active = _profile_rules(_normalize_profile(profile_name))
+    return [_detect_with(active, text, flag) for text, flag in zip(texts, unicode_flags)]
+
+
+def _detect_with(active: _ProfileRules, text: str, unicode_suspicious: bool) -> List[str]:
+    """Scan one text against an already resolved profile rule set."""
+
     reasons = set()
     language_hints = set()
 
-    for rule in _active_rules(profile_name, _DETECTION_RULES):
+    for rule in active.rules:
         if rule.pattern.search(text):
             reasons.add(rule.code)
 
     collapsed = None
-    for pattern, code in _OBFUSCATED_PATTERNS:
-        if not _profile_allows_reason(profile_name, code):
-            continue
+    for pattern, code in active.obfuscated:
         if collapsed is None:
             collapsed = _collapse_text(text)
         if pattern in collapsed:
             reasons.add(code)
 
-    for language, patterns in _OBFUSCATED_CORE_LANGUAGE_PATTERNS.items():
+    for language, patterns in active.obfuscated_core_language:
         for pattern, code in patterns:
-            if not _profile_allows_reason(profile_name, code):
-                continue
             if collapsed is None:
                 collapsed = _collapse_text(text)
             if pattern in collapsed:
                 reasons.add(code)
                 language_hints.add(language)
 
-    for language, rules in _CORE_LANGUAGE_RULES.items():
-        for rule in _active_rules(profile_name, rules):
+    for language, rules in active.core_language_rules:
+        for rule in rules:
             if rule.pattern.search(text):
                 reasons.add(rule.code)
                 language_hints.add(language)
 
     for language in sorted(language_hints):
-        for rule in _active_rules(profile_name, _EXTENDED_LANGUAGE_RULES.get(language, [])):
+        for rule in active.extended_language_rules.get(language, ()):
             if rule.pattern.search(text):
                 reasons.add(rule.code)
-        for pattern, code in _OBFUSCATED_EXTENDED_LANGUAGE_PATTERNS.get(language, []):
-            if not _profile_allows_reason(profile_name, code):
-                continue
+        for pattern, code in active.obfuscated_extended_language.get(language, ()):
             if collapsed is None:
                 collapsed = _collapse_text(text)
             if pattern in collapsed:
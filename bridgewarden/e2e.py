@@ -13,6 +13,7 @@ _GUARD_RESULT_KEYS = {
     "sanitized_text",
     "policy_version",
 }
+_JSON_DECODER = json.JSONDecoder()
 
 
 def extract_guard_results(json_lines: Iterable[str]) -> List[Dict[str, Any]]:
@@ -20,8 +21,12 @@ def extract_guard_results(json_lines: Iterable[str]) -> List[Dict[str, Any]]:
 
     results: List[Dict[str, Any]] = []
     for line in json_lines:
+        stripped = line.strip()
+        # Skip plain log lines without invoking the decoder.
+        if not stripped or stripped[0] not in "{[\"":
+            continue
         try:
-            payload = json.loads(line)
+            payload = _JSON_DECODER.decode(stripped)
         except json.JSONDecodeError:
             continue
         _walk(payload, results)
@@ -62,7 +67,7 @@ def _maybe_parse_guard_text(text: str, results: List[Dict[str, Any]]) -> None:
     if stripped[0] not in "{[":
         return
     try:
-        parsed = json.loads(stripped)
+        parsed = _JSON_DECODER.decode(stripped)
     except json.JSONDecodeError:
         return
     _walk(parsed, results)
@@ -1,8 +1,7 @@
 """HTTP helpers used by the optional network backends."""
 
-import urllib.request
 from dataclasses import dataclass
-from typing import Optional
+from typing import BinaryIO, Optional
 from urllib.parse import urlparse
 
 
@@ -24,6 +23,10 @@ class HttpClient:
         if max_bytes <= 0:
             raise NetworkError("max_bytes must be positive")
 
+        # Imported here: urllib.request pulls in http.client and email, and most
+        # sessions run with the network disabled.
+        import urllib.request
+
         request = urllib.request.Request(
             url,
             headers={"User-Agent": "BridgeWarden/0.1"},
@@ -48,7 +51,7 @@ class WebFetcher:
         return payload.decode("utf-8", errors="replace")
 
 
-def _read_limited(response: urllib.request.addinfourl, max_bytes: int) -> bytes:
+def _read_limited(response: BinaryIO, max_bytes: int) -> bytes:
     """Read up to max_bytes from a response stream."""
 
     buffer = bytearray()
@@ -1,11 +1,15 @@
 """Unicode normalization and suspicious character stripping."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 import unicodedata
 
 BIDI_CHARS = set("\u202A\u202B\u202D\u202E\u202C\u2066\u2067\u2068\u2069")
 ZERO_WIDTH_CHARS = set("\u200B\u200C\u200D\u2060\uFEFF")
 
+# Only short texts are memoized so the cache never pins large fetched documents.
+_CACHE_MAX_CHARS = 4096
+
 
 @dataclass(frozen=True)
 class NormalizedText:
@@ -18,6 +22,14 @@ class NormalizedText:
 def normalize_text(text: str) -> NormalizedText:
     """Normalize text to NFKC and strip bidi/zero-width characters."""
 
+    if len(text) <= _CACHE_MAX_CHARS:
+        return _normalize_cached(text)
+    return _normalize(text)
+
+
+def _normalize(text: str) -> NormalizedText:
+    """Run NFKC normalization and strip suspicious characters."""
+
     normalized = unicodedata.normalize("NFKC", text)
     normalized = normalized.replace("\r\n", "\n").replace("\r", "\n")
     suspicious = False
@@ -28,3 +40,10 @@ def normalize_text(text: str) -> NormalizedText:
             continue
         cleaned.append(ch)
     return NormalizedText(text="".join(cleaned), unicode_suspicious=suspicious)
+
+
+@lru_cache(maxsize=2048)
+def _normalize_cached(text: str) -> NormalizedText:
+    """Memoized normalization for short, frequently repeated texts."""
+
+    return _normalize(text)
@@ -1,13 +1,14 @@
 """Core guard pipeline: normalize, sanitize, detect, redact, decide."""
 
+from dataclasses import dataclass
 import hashlib
-from typing import Dict, Optional, TYPE_CHECKING
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
 
 from .audit import AuditLogger
 from .config import DEFAULT_PROFILE, POLICY_VERSION
 from .decision import decide, get_profile
 from .detect import detect_reasons
-from .normalize import normalize_text
+from .normalize import NormalizedText, normalize_text
 from .redact import redact_secrets
 from .sanitize import sanitize_text
 from .types import GuardResult
@@ -23,6 +24,30 @@ def _content_hash(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
+@dataclass(frozen=True)
+class PreparedText:
+    """Profile-independent pipeline stages computed for a single input."""
+
+    text: str
+    normalized: NormalizedText
+    redacted_text: str
+    redactions: Tuple[Dict[str, int], ...]
+    content_hash: str
+
+
+def prepare_text(text: str) -> PreparedText:
+    """Run the normalize, sanitize, redact and hash stages once for reuse."""
+
+    normalized = normalize_text(text)
+    redacted_text, redactions = redact_secrets(sanitize_text(normalized.text))
+    return PreparedText(
+        text=text,
+        normalized=normalized,
+        redacted_text=redacted_text,
+        redactions=tuple(redactions),
+        content_hash=_content_hash(text),
+    )
+
 
 def guard_text(
     text: str,
@@ -30,21 +55,25 @@ def guard_text(
     quarantine_store: Optional["QuarantineStore"] = None,
     profile_name: str = DEFAULT_PROFILE,
     audit_logger: Optional[AuditLogger] = None,
+    prepared: Optional[PreparedText] = None,
 ) -> GuardResult:
     """Run the guard pipeline and return a GuardResult."""
 
     source_value = source or {"kind": "local"}
-    normalized = normalize_text(text)
-    sanitized = sanitize_text(normalized.text)
+    if prepared is None or prepared.text != text:
+        prepared = prepare_text(text)
+    normalized = prepared.normalized
     reasons = detect_reasons(
         normalized.text,
         unicode_suspicious=normalized.unicode_suspicious,
         profile_name=profile_name,
     )
-    redacted_text, redactions = redact_secrets(sanitized)
+    redacted_text = prepared.redacted_text
+    # Each result gets its own copies so callers can't mutate another result's entries.
+    redactions = [dict(entry) for entry in prepared.redactions]
     profile = get_profile(profile_name)
     decision, risk_score = decide(reasons, profile)
-    content_hash = _content_hash(text)
+    content_hash = prepared.content_hash
 
     if decision == "BLOCK":
         sanitized_text = ""
@@ -1,6 +1,8 @@
 """Quarantine storage for blocked content and review excerpts."""
 
 import json
+import os
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -44,6 +46,7 @@ class QuarantineStore:
         """Initialize the store with a root directory."""
 
         self.root = Path(root)
+        self._lock = threading.Lock()
 
     def put(
         self,
@@ -58,20 +61,25 @@ class QuarantineStore:
         quarantine_id = build_quarantine_id(content_hash)
         record_dir = self.root / quarantine_id
         record_path = record_dir / RECORD_FILENAME
-        if record_path.exists():
-            return quarantine_id
-
-        record_dir.mkdir(parents=True, exist_ok=True)
-        (record_dir / ORIGINAL_FILENAME).write_text(original_text, encoding="utf-8")
-        (record_dir / SANITIZED_FILENAME).write_text(sanitized_text, encoding="utf-8")
-
-        created_at = timestamp or datetime.now(timezone.utc).isoformat()
-        record = {
-            "content_hash": content_hash,
-            "created_at": created_at,
-            **metadata,
-        }
-        record_path.write_text(json.dumps(record, sort_keys=True), encoding="utf-8")
+        with self._lock:
+            if record_path.exists():
+                return quarantine_id
+
+            record_dir.mkdir(parents=True, exist_ok=True)
+            (record_dir / ORIGINAL_FILENAME).write_text(original_text, encoding="utf-8")
+            (record_dir / SANITIZED_FILENAME).write_text(sanitized_text, encoding="utf-8")
+
+            created_at = timestamp or datetime.now(timezone.utc).isoformat()
+            record = {
+                "content_hash": content_hash,
+                "created_at": created_at,
+                **metadata,
+            }
+            # The record is written last and swapped in whole, so readers that find it
+            # also see complete text files.
+            tmp_path = record_dir / f".{RECORD_FILENAME}.tmp"
+            tmp_path.write_text(json.dumps(record, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, record_path)
         return quarantine_id
 
     def get_record(self, quarantine_id: str) -> Dict[str, object]:
@@ -16,9 +16,7 @@ def redact_secrets(text: str) -> Tuple[str, List[Dict[str, int]]]:
     redactions: List[Dict[str, int]] = []
     redacted_text = text
     for kind, pattern in _REDACTION_RULES:
-        matches = list(pattern.finditer(redacted_text))
-        if not matches:
-            continue
-        redacted_text = pattern.sub("[REDACTED]", redacted_text)
-        redactions.append({"kind": kind, "count": len(matches)})
+        redacted_text, count = pattern.subn("[REDACTED]", redacted_text)
+        if count:
+            redactions.append({"kind": kind, "count": count})
     return redacted_text, redactions
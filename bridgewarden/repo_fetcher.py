@@ -2,11 +2,13 @@
 
 import hashlib
 import io
+import os
 import tarfile
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path, PurePosixPath
 import re
-from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 from .audit import AuditLogger
@@ -52,10 +54,17 @@ class RepoFetcher:
         repo_root = self.storage_dir / repo_id / revision
         repo_root.mkdir(parents=True, exist_ok=True)
 
-        findings: List[Dict[str, object]] = []
-        quarantine_ids: List[str] = []
-        changed_files: List[Dict[str, str]] = []
-        allow_count = warn_count = block_count = 0
+        files = self._extract_files(payload, repo_root, include_paths, exclude_paths)
+        return {"repo_id": repo_id, "new_revision": revision, **self._scan_files(url, files)}
+
+    def _extract_files(
+        self,
+        payload: bytes,
+        repo_root: Path,
+        include_paths: Optional[List[str]],
+        exclude_paths: Optional[List[str]],
+    ) -> Iterator["_RepoFile"]:
+        """Store archive members under repo_root and yield them for scanning."""
 
         with tarfile.open(fileobj=io.BytesIO(payload), mode="r:gz") as archive:
             members = [member for member in archive.getmembers() if member.isreg()]
@@ -77,46 +86,57 @@ class RepoFetcher:
 
                 destination = _safe_join(repo_root, rel_path)
                 destination.parent.mkdir(parents=True, exist_ok=True)
-                destination.write_bytes(content_bytes)
-
-                if truncated:
-                    findings.append(
-                        {
-                            "path": rel_path,
-                            "decision": "BLOCK",
-                            "risk_score": 1.0,
-                            "reasons": ["FILE_TOO_LARGE"],
-                            "content_hash": content_hash,
-                        }
-                    )
-                    block_count += 1
+                _write_atomic(destination, content_bytes)
+                yield _RepoFile(rel_path, content_bytes, content_hash, truncated)
+
+    def _scan_files(self, url: str, files: Iterable["_RepoFile"]) -> Dict[str, object]:
+        """Run repo files through the pipeline and summarize the findings."""
+
+        findings: List[Dict[str, object]] = []
+        quarantine_ids: List[str] = []
+        changed_files: List[Dict[str, str]] = []
+        allow_count = warn_count = block_count = 0
+
+        for repo_file in files:
+            rel_path = repo_file.path
+            if repo_file.truncated:
+                findings.append(
+                    {
+                        "path": rel_path,
+                        "decision": "BLOCK",
+                        "risk_score": 1.0,
+                        "reasons": ["FILE_TOO_LARGE"],
+                        "content_hash": repo_file.content_hash,
+                    }
+                )
+                block_count += 1
+            else:
+                result = guard_text(
+                    repo_file.content.decode("utf-8", errors="replace"),
+                    source={"kind": "repo", "url": url, "path": rel_path},
+                    quarantine_store=self.quarantine_store,
+                    profile_name=self.profile_name,
+                    audit_logger=self.audit_logger,
+                )
+                findings.append(
+                    {
+                        "path": rel_path,
+                        "decision": result.decision,
+                        "risk_score": result.risk_score,
+                        "reasons": result.reasons,
+                        "content_hash": result.content_hash,
+                    }
+                )
+                if result.decision == "ALLOW":
+                    allow_count += 1
+                elif result.decision == "WARN":
+                    warn_count += 1
                 else:
-                    result = guard_text(
-                        content_bytes.decode("utf-8", errors="replace"),
-                        source={"kind": "repo", "url": url, "path": rel_path},
-                        quarantine_store=self.quarantine_store,
-                        profile_name=self.profile_name,
-                        audit_logger=self.audit_logger,
-                    )
-                    findings.append(
-                        {
-                            "path": rel_path,
-                            "decision": result.decision,
-                            "risk_score": result.risk_score,
-                            "reasons": result.reasons,
-                            "content_hash": result.content_hash,
-                        }
-                    )
-                    if result.decision == "ALLOW":
-                        allow_count += 1
-                    elif result.decision == "WARN":
-                        warn_count += 1
-                    else:
-                        block_count += 1
-                        if result.quarantine_id:
-                            quarantine_ids.append(result.quarantine_id)
-
-                changed_files.append({"path": rel_path, "status": "added"})
+                    block_count += 1
+                    if result.quarantine_id:
+                        quarantine_ids.append(result.quarantine_id)
+
+            changed_files.append({"path": rel_path, "status": "added"})
 
         summary = {
             "total": len(findings),
@@ -126,8 +146,6 @@ class RepoFetcher:
             "cache_hits": 0,
         }
         return {
-            "repo_id": repo_id,
-            "new_revision": revision,
             "changed_files": changed_files,
             "summary": summary,
             "findings": findings,
@@ -135,6 +153,16 @@ class RepoFetcher:
         }
 
 
+@dataclass(frozen=True)
+class _RepoFile:
+    """A repo file read from the archive, capped at max_file_bytes."""
+
+    path: str
+    content: bytes
+    content_hash: str
+    truncated: bool
+
+
 def _repo_id(url: str) -> str:
     """Build a deterministic repo id from its URL."""
 
@@ -225,6 +253,19 @@ def _read_member(fileobj: io.BufferedReader, max_bytes: int) -> Tuple[bytes, str
     return bytes(buffer), hasher.hexdigest(), truncated
 
 
+def _write_atomic(destination: Path, content: bytes) -> None:
+    """Write a file via a unique temp file so concurrent fetches never mix contents."""
+
+    fd, tmp_name = tempfile.mkstemp(dir=destination.parent, prefix=".bw-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+        os.replace(tmp_name, destination)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 def _safe_join(root: Path, relative_path: str) -> Path:
     """Join paths while preventing traversal outside the repo root."""
 
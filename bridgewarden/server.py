@@ -1,11 +1,12 @@
 """Minimal stdio MCP server harness for BridgeWarden."""
 
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import asdict, dataclass, is_dataclass
-from functools import partial
+from functools import lru_cache, partial
 import json
 from pathlib import Path
 import sys
-from typing import Callable, Dict, IO, Optional
+from typing import Callable, Dict, FrozenSet, IO, List, Optional, Tuple, Union
 
 from .approvals import SourceApprovalStore
 from .audit import AuditLogger
@@ -27,160 +28,198 @@ from .tools import (
 DEFAULT_CONFIG_PATH = Path("config/bridgewarden.yaml")
 DEFAULT_DATA_DIR = Path(".bridgewarden")
 JSONRPC_VERSION = "2.0"
-SUPPORTED_PROTOCOL_VERSIONS = ("2025-06-18", "2025-03-26", "2024-11-05")
-DEFAULT_PROTOCOL_VERSION = SUPPORTED_PROTOCOL_VERSIONS[0]
+DEFAULT_PROTOCOL_VERSION = "2025-06-18"
+SUPPORTED_PROTOCOL_VERSIONS = frozenset({DEFAULT_PROTOCOL_VERSION, "2025-03-26", "2024-11-05"})
+_METHODS = frozenset(
+    {"initialize", "notifications/initialized", "ping", "tools/list", "tools/call"}
+)
+# Methods that read their params; the others accept and ignore any params value.
+_PARAMS_OBJECT_METHODS = frozenset({"initialize", "tools/list", "tools/call"})
 SERVER_NAME = "bridgewarden"
 SERVER_VERSION = "0.1.0"
+DEFAULT_BATCH_WORKERS = 8
+# Tools that run concurrently inside a batch. The fetch tools share the quarantine,
+# audit and approval stores, which lock their own writes; approval requests and
+# decisions stay inline so a batch applies them in order.
+PARALLEL_TOOLS = frozenset(
+    {
+        "bw_read_file",
+        "bw_web_fetch",
+        "bw_fetch_repo",
+        "bw_quarantine_get",
+        "bw_get_source_approval",
+        "bw_list_source_approvals",
+    }
+)
+_COMPACT_SEPARATORS = (",", ":")
+_JSON_DECODER = json.JSONDecoder()
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=True)
+_COMPACT_JSON_ENCODER = json.JSONEncoder(ensure_ascii=True, separators=_COMPACT_SEPARATORS)
+_RESULT_TEMPLATE = '{"jsonrpc": "2.0", "id": %s, "result": %s}'
+_PING_RESPONSE_TEMPLATE = '{"jsonrpc": "2.0", "id": %s, "result": {}}'
 
-TOOL_DEFINITIONS: Dict[str, Dict[str, object]] = {
-    "bw_read_file": {
-        "name": "bw_read_file",
-        "description": "Read a file and return a GuardResult.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "repo_id": {"type": "string", "description": "Optional repo id."},
-                "path": {"type": "string", "description": "Path to file."},
-                "mode": {
-                    "type": "string",
-                    "enum": ["safe", "raw"],
-                    "description": "Read mode (default safe).",
+
+@lru_cache(maxsize=None)
+def _build_tool_definitions() -> Dict[str, Dict[str, object]]:
+    """Build the MCP tool definitions on first use."""
+
+    return {
+        "bw_read_file": {
+            "name": "bw_read_file",
+            "description": "Read a file and return a GuardResult.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "repo_id": {"type": "string", "description": "Optional repo id."},
+                    "path": {"type": "string", "description": "Path to file."},
+                    "mode": {
+                        "type": "string",
+                        "enum": ["safe", "raw"],
+                        "description": "Read mode (default safe).",
+                    },
                 },
+                "required": ["path"],
+                "additionalProperties": False,
             },
-            "required": ["path"],
-            "additionalProperties": False,
         },
-    },
-    "bw_web_fetch": {
-        "name": "bw_web_fetch",
-        "description": "Fetch a URL and return a GuardResult.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "url": {"type": "string", "description": "URL to fetch."},
-                "mode": {
-                    "type": "string",
-                    "enum": ["readable_text", "raw_text"],
-                    "description": "Response mode (default readable_text).",
-                },
-                "max_bytes": {
-                    "type": "integer",
-                    "description": "Optional max bytes (clamped by policy).",
+        "bw_web_fetch": {
+            "name": "bw_web_fetch",
+            "description": "Fetch a URL and return a GuardResult.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "url": {"type": "string", "description": "URL to fetch."},
+                    "mode": {
+                        "type": "string",
+                        "enum": ["readable_text", "raw_text"],
+                        "description": "Response mode (default readable_text).",
+                    },
+                    "max_bytes": {
+                        "type": "integer",
+                        "description": "Optional max bytes (clamped by policy).",
+                    },
                 },
+                "required": ["url"],
+                "additionalProperties": False,
             },
-            "required": ["url"],
-            "additionalProperties": False,
         },
-    },
-    "bw_fetch_repo": {
-        "name": "bw_fetch_repo",
-        "description": "Fetch a repository and scan its contents.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "url": {"type": "string", "description": "Repository URL."},
-                "ref": {"type": "string", "description": "Optional git ref."},
-                "depth": {"type": "integer", "description": "Optional clone depth."},
-                "include_paths": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Optional include paths.",
-                },
-                "exclude_paths": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Optional exclude paths.",
-                },
-                "baseline_revision": {
-                    "type": "string",
-                    "description": "Optional baseline revision.",
+        "bw_fetch_repo": {
+            "name": "bw_fetch_repo",
+            "description": "Fetch a repository and scan its contents.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "url": {"type": "string", "description": "Repository URL."},
+                    "ref": {"type": "string", "description": "Optional git ref."},
+                    "depth": {"type": "integer", "description": "Optional clone depth."},
+                    "include_paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional include paths.",
+                    },
+                    "exclude_paths": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional exclude paths.",
+                    },
+                    "baseline_revision": {
+                        "type": "string",
+                        "description": "Optional baseline revision.",
+                    },
                 },
+                "required": ["url"],
+                "additionalProperties": False,
             },
-            "required": ["url"],
-            "additionalProperties": False,
         },
-    },
-    "bw_quarantine_get": {
-        "name": "bw_quarantine_get",
-        "description": "Retrieve a quarantined excerpt by id.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {"id": {"type": "string", "description": "Quarantine id."}},
-            "required": ["id"],
-            "additionalProperties": False,
+        "bw_quarantine_get": {
+            "name": "bw_quarantine_get",
+            "description": "Retrieve a quarantined excerpt by id.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {"id": {"type": "string", "description": "Quarantine id."}},
+                "required": ["id"],
+                "additionalProperties": False,
+            },
         },
-    },
-    "bw_request_source_approval": {
-        "name": "bw_request_source_approval",
-        "description": "Request approval for a new source.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "request": {
-                    "type": "object",
-                    "properties": {
-                        "kind": {
-                            "type": "string",
-                            "enum": ["web_domain", "repo_url", "upstream_mcp_server"],
+        "bw_request_source_approval": {
+            "name": "bw_request_source_approval",
+            "description": "Request approval for a new source.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "request": {
+                        "type": "object",
+                        "properties": {
+                            "kind": {
+                                "type": "string",
+                                "enum": ["web_domain", "repo_url", "upstream_mcp_server"],
+                            },
+                            "target": {"type": "string"},
+                            "rationale": {"type": "string"},
+                            "requested_by": {"type": "string"},
                         },
-                        "target": {"type": "string"},
-                        "rationale": {"type": "string"},
-                        "requested_by": {"type": "string"},
-                    },
-                    "required": ["kind", "target"],
-                    "additionalProperties": False,
-                }
+                        "required": ["kind", "target"],
+                        "additionalProperties": False,
+                    }
+                },
+                "required": ["request"],
+                "additionalProperties": False,
             },
-            "required": ["request"],
-            "additionalProperties": False,
         },
-    },
-    "bw_get_source_approval": {
-        "name": "bw_get_source_approval",
-        "description": "Get an approval request status.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "approval_id": {"type": "string", "description": "Approval id."}
+        "bw_get_source_approval": {
+            "name": "bw_get_source_approval",
+            "description": "Get an approval request status.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "approval_id": {"type": "string", "description": "Approval id."}
+                },
+                "required": ["approval_id"],
+                "additionalProperties": False,
             },
-            "required": ["approval_id"],
-            "additionalProperties": False,
         },
-    },
-    "bw_list_source_approvals": {
-        "name": "bw_list_source_approvals",
-        "description": "List source approval requests.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "status": {
-                    "type": "string",
-                    "enum": ["PENDING", "APPROVED", "DENIED"],
-                },
-                "kind": {
-                    "type": "string",
-                    "enum": ["web_domain", "repo_url", "upstream_mcp_server"],
+        "bw_list_source_approvals": {
+            "name": "bw_list_source_approvals",
+            "description": "List source approval requests.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "status": {
+                        "type": "string",
+                        "enum": ["PENDING", "APPROVED", "DENIED"],
+                    },
+                    "kind": {
+                        "type": "string",
+                        "enum": ["web_domain", "repo_url", "upstream_mcp_server"],
+                    },
+                    "limit": {"type": "integer"},
                 },
-                "limit": {"type": "integer"},
+                "additionalProperties": False,
             },
-            "additionalProperties": False,
         },
-    },
-    "bw_decide_source_approval": {
-        "name": "bw_decide_source_approval",
-        "description": "Approve or deny a source approval request.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "approval_id": {"type": "string"},
-                "decision": {"type": "string", "enum": ["APPROVED", "DENIED"]},
-                "notes": {"type": "string"},
+        "bw_decide_source_approval": {
+            "name": "bw_decide_source_approval",
+            "description": "Approve or deny a source approval request.",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "approval_id": {"type": "string"},
+                    "decision": {"type": "string", "enum": ["APPROVED", "DENIED"]},
+                    "notes": {"type": "string"},
+                },
+                "required": ["approval_id", "decision"],
+                "additionalProperties": False,
             },
-            "required": ["approval_id", "decision"],
-            "additionalProperties": False,
         },
-    },
-}
+    }
+
+
+def __getattr__(name: str) -> object:
+    """Lazily expose TOOL_DEFINITIONS without building it at import time."""
+
+    if name == "TOOL_DEFINITIONS":
+        return _build_tool_definitions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @dataclass(frozen=True)
@@ -276,28 +315,178 @@ def build_tool_handlers(context: BridgewardenContext) -> Dict[str, Callable[...,
     }
 
 
+def _result(request_id: object, result: object) -> Dict[str, object]:
+    """Create a JSON-RPC success payload."""
+
+    return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
+
+
+def _tool_error(request_id: object, message: str) -> Dict[str, object]:
+    """Return a tool error payload."""
+
+    return {
+        "jsonrpc": JSONRPC_VERSION,
+        "id": request_id,
+        "result": {"content": [{"type": "text", "text": message}], "isError": True},
+    }
+
+
+def _error(request_id: object, code: int, message: str) -> Dict[str, object]:
+    """Create a JSON-RPC error payload."""
+
+    return {
+        "jsonrpc": JSONRPC_VERSION,
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def _validate_envelope(
+    jsonrpc: object, request_id: object, method: object, params: object
+) -> Tuple[bool, Optional[Dict[str, object]]]:
+    """Validate the JSON-RPC envelope once; return (valid, error payload or None)."""
+
+    if jsonrpc != JSONRPC_VERSION:
+        return False, _error(None, -32600, "invalid or missing jsonrpc version")
+    if not isinstance(method, str):
+        return False, _error(request_id, -32600, "missing method")
+    # Notifications never get a reply for method or params problems.
+    if method not in _METHODS:
+        if request_id is None:
+            return False, None
+        return False, _error(request_id, -32601, f"unknown method: {method}")
+    if (
+        method in _PARAMS_OBJECT_METHODS
+        and params is not None
+        and not isinstance(params, dict)
+    ):
+        if request_id is None:
+            return False, None
+        return False, _error(request_id, -32602, "params must be an object")
+    return True, None
+
+
 class BridgewardenServer:
     """Dispatch JSON-RPC MCP requests for BridgeWarden tools."""
 
-    def __init__(self, handlers: Dict[str, Callable[..., object]]) -> None:
+    __slots__ = (
+        "_handlers",
+        "_protocol_version",
+        "_initialized",
+        "_tools_list_payload",
+        "_batch_workers",
+        "_parallel_tools",
+        "_executor",
+    )
+
+    def __init__(
+        self,
+        handlers: Dict[str, Callable[..., object]],
+        batch_workers: int = DEFAULT_BATCH_WORKERS,
+        parallel_tools: FrozenSet[str] = PARALLEL_TOOLS,
+    ) -> None:
         """Initialize the server with tool handlers."""
 
         self._handlers = handlers
         self._protocol_version = DEFAULT_PROTOCOL_VERSION
         self._initialized = False
+        self._tools_list_payload: Optional[str] = None
+        self._batch_workers = batch_workers
+        self._parallel_tools = parallel_tools
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def close(self) -> None:
+        """Shut down the batch worker pool, if one was started."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def handle_request(self, request: Dict[str, object]) -> Optional[Dict[str, object]]:
         """Handle a single JSON-RPC MCP request payload."""
 
-        if request.get("jsonrpc") != JSONRPC_VERSION:
-            return self._error(None, -32600, "invalid or missing jsonrpc version")
+        jsonrpc = request.get("jsonrpc")
         method = request.get("method")
-        if not isinstance(method, str):
-            return self._error(request.get("id"), -32600, "missing method")
-        params = request.get("params", {})
-        if params is None:
+        params = request.get("params")
+        request_id = request.get("id")
+        valid, envelope_error = _validate_envelope(jsonrpc, request_id, method, params)
+        if not valid:
+            return envelope_error
+        if not isinstance(params, dict):
             params = {}
+        return self._dispatch(method, params, request_id)
+
+    def handle_request_json(self, request: Dict[str, object]) -> Optional[str]:
+        """Handle a request and return the serialized JSON-RPC response line."""
+
+        jsonrpc = request.get("jsonrpc")
+        method = request.get("method")
+        params = request.get("params")
         request_id = request.get("id")
+        valid, envelope_error = _validate_envelope(jsonrpc, request_id, method, params)
+        if not valid:
+            return None if envelope_error is None else _dumps(envelope_error)
+        if method == "ping":
+            return _PING_RESPONSE_TEMPLATE % _dumps(request_id)
+        if method == "tools/list":
+            if self._tools_list_payload is None:
+                self._tools_list_payload = _dumps(self._list_tools())
+            return _RESULT_TEMPLATE % (_dumps(request_id), self._tools_list_payload)
+        if not isinstance(params, dict):
+            params = {}
+        response = self._dispatch(method, params, request_id)
+        if response is None:
+            return None
+        return _dumps(response)
+
+    def handle_batch_json(self, entries: List[object]) -> List[str]:
+        """Handle a JSON-RPC batch, running parallel-safe tool calls concurrently in order."""
+
+        pending: List[Union[Optional[str], "Future[Optional[str]]"]] = []
+        running: List["Future[Optional[str]]"] = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                pending.append(_dumps(_error(None, -32600, "request must be an object")))
+            elif self._is_parallel_call(entry):
+                future = self._batch_executor().submit(self.handle_request_json, entry)
+                running.append(future)
+                pending.append(future)
+            else:
+                # Let in-flight calls finish so they never overlap an inline entry.
+                if running:
+                    wait(running)
+                    running = []
+                pending.append(self.handle_request_json(entry))
+        responses: List[str] = []
+        for item in pending:
+            response = item.result() if isinstance(item, Future) else item
+            if response is not None:
+                responses.append(response)
+        return responses
+
+    def _is_parallel_call(self, entry: Dict[str, object]) -> bool:
+        """Return True for a tools/call entry that may run on the worker pool."""
+
+        if entry.get("method") != "tools/call":
+            return False
+        params = entry.get("params")
+        if not isinstance(params, dict):
+            return False
+        return (params.get("name") or params.get("tool")) in self._parallel_tools
+
+    def _batch_executor(self) -> ThreadPoolExecutor:
+        """Return the batch worker pool, starting it on first use."""
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._batch_workers, thread_name_prefix="bridgewarden-batch"
+            )
+        return self._executor
+
+    def _dispatch(
+        self, method: str, params: Dict[str, object], request_id: object
+    ) -> Optional[Dict[str, object]]:
+        """Route a validated request to its method handler."""
 
         if method == "initialize":
             return self._handle_initialize(request_id, params)
@@ -305,15 +494,11 @@ class BridgewardenServer:
             self._initialized = True
             return None
         if method == "ping":
-            return self._result(request_id, {})
+            return _result(request_id, {})
         if method == "tools/list":
             return self._handle_tools_list(request_id, params)
-        if method == "tools/call":
-            return self._handle_tools_call(request_id, params)
-
-        if request_id is None:
-            return None
-        return self._error(request_id, -32601, f"unknown method: {method}")
+        # _validate_envelope only admits _METHODS, so this is tools/call.
+        return self._handle_tools_call(request_id, params)
 
     def _serialize(self, result: object) -> object:
         """Serialize dataclass results to plain dicts."""
@@ -323,19 +508,17 @@ class BridgewardenServer:
         return result
 
     def _handle_initialize(
-        self, request_id: object, params: object
+        self, request_id: object, params: Dict[str, object]
     ) -> Dict[str, object]:
         """Handle the MCP initialize handshake."""
 
-        if not isinstance(params, dict):
-            return self._error(request_id, -32602, "params must be an object")
         version = params.get("protocolVersion")
         if isinstance(version, str):
             if version in SUPPORTED_PROTOCOL_VERSIONS:
                 self._protocol_version = version
             else:
                 self._protocol_version = DEFAULT_PROTOCOL_VERSION
-        return self._result(
+        return _result(
             request_id,
             {
                 "protocolVersion": self._protocol_version,
@@ -345,15 +528,19 @@ class BridgewardenServer:
         )
 
     def _handle_tools_list(
-        self, request_id: object, params: object
+        self, request_id: object, params: Dict[str, object]
     ) -> Dict[str, object]:
         """Return the list of available tools."""
 
-        if not isinstance(params, dict) and params is not None:
-            return self._error(request_id, -32602, "params must be an object")
+        return _result(request_id, self._list_tools())
+
+    def _list_tools(self) -> Dict[str, object]:
+        """Build the tools/list result for the registered handlers."""
+
+        definitions = _build_tool_definitions()
         tools = []
         for name in sorted(self._handlers):
-            definition = TOOL_DEFINITIONS.get(name)
+            definition = definitions.get(name)
             if definition is None:
                 tools.append(
                     {
@@ -364,60 +551,44 @@ class BridgewardenServer:
                 )
             else:
                 tools.append(definition)
-        return self._result(request_id, {"tools": tools, "nextCursor": None})
+        return {"tools": tools, "nextCursor": None}
 
     def _handle_tools_call(
-        self, request_id: object, params: object
+        self, request_id: object, params: Dict[str, object]
     ) -> Dict[str, object]:
         """Invoke a tool and wrap its output."""
 
-        if not isinstance(params, dict):
-            return self._error(request_id, -32602, "params must be an object")
         name = params.get("name") or params.get("tool")
         if not isinstance(name, str):
-            return self._error(request_id, -32602, "missing tool name")
+            return _error(request_id, -32602, "missing tool name")
         arguments = params.get("arguments", params.get("args", {}))
         if arguments is None:
             arguments = {}
         if not isinstance(arguments, dict):
-            return self._error(request_id, -32602, "arguments must be an object")
+            return _error(request_id, -32602, "arguments must be an object")
         handler = self._handlers.get(name)
         if handler is None:
-            return self._tool_error(request_id, f"unknown tool: {name}")
+            return _tool_error(request_id, f"unknown tool: {name}")
         try:
             result = handler(**arguments)
         except Exception as exc:
-            return self._tool_error(request_id, str(exc))
+            return _tool_error(request_id, str(exc))
         serialized = self._serialize(result)
-        payload = json.dumps(serialized, ensure_ascii=True)
-        return self._result(
-            request_id,
-            {"content": [{"type": "text", "text": payload}], "isError": False},
-        )
-
-    def _result(self, request_id: object, result: object) -> Dict[str, object]:
-        """Create a JSON-RPC success payload."""
-
-        return {"jsonrpc": JSONRPC_VERSION, "id": request_id, "result": result}
-
-    def _tool_error(self, request_id: object, message: str) -> Dict[str, object]:
-        """Return a tool error payload."""
-
-        return self._result(
-            request_id,
-            {"content": [{"type": "text", "text": message}], "isError": True},
-        )
-
-    def _error(self, request_id: object, code: int, message: str) -> Dict[str, object]:
-        """Create a JSON-RPC error payload."""
-
+        # The payload is escaped again inside the outer envelope, so keep it compact.
+        payload = _COMPACT_JSON_ENCODER.encode(serialized)
         return {
             "jsonrpc": JSONRPC_VERSION,
             "id": request_id,
-            "error": {"code": code, "message": message},
+            "result": {"content": [{"type": "text", "text": payload}], "isError": False},
         }
 
 
+def _dumps(payload: object) -> str:
+    """Serialize a JSON-RPC payload for the stdio transport."""
+
+    return _JSON_ENCODER.encode(payload)
+
+
 def serve_stdio(
     server: BridgewardenServer,
     input_stream: IO[str] = sys.stdin,
@@ -430,30 +601,23 @@ def serve_stdio(
         if not line:
             continue
         try:
-            request = json.loads(line)
+            request = _JSON_DECODER.decode(line)
         except json.JSONDecodeError as exc:
-            response = server._error(None, -32700, str(exc))
+            response = _dumps(_error(None, -32700, str(exc)))
         else:
             if isinstance(request, list):
-                responses = []
-                for entry in request:
-                    if not isinstance(entry, dict):
-                        responses.append(server._error(None, -32600, "request must be an object"))
-                        continue
-                    response = server.handle_request(entry)
-                    if response is not None:
-                        responses.append(response)
+                responses = server.handle_batch_json(request)
                 if responses:
-                    output_stream.write(json.dumps(responses, ensure_ascii=True) + "\n")
+                    output_stream.write("[" + ", ".join(responses) + "]\n")
                     output_stream.flush()
                 continue
             if not isinstance(request, dict):
-                response = server._error(None, -32600, "request must be an object")
+                response = _dumps(_error(None, -32600, "request must be an object"))
             else:
-                response = server.handle_request(request)
+                response = server.handle_request_json(request)
             if response is None:
                 continue
-        output_stream.write(json.dumps(response, ensure_ascii=True) + "\n")
+        output_stream.write(response + "\n")
         output_stream.flush()
 
 
@@ -489,7 +653,10 @@ def main(argv: Optional[list] = None) -> int:
         base_dir=Path(args.base_dir),
     )
     server = BridgewardenServer(build_tool_handlers(context))
-    serve_stdio(server)
+    try:
+        serve_stdio(server)
+    finally:
+        server.close()
     return 0
 
 
@@ -1,20 +1,39 @@
 """Tool implementations for BridgeWarden MCP endpoints."""
 
-from dataclasses import asdict
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+import os
 from pathlib import Path
 import socket
-from typing import Callable, Dict, List, Optional
-from urllib.parse import urlparse
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import ParseResult, urlparse
 import ipaddress
 
 from .approvals import SourceApprovalRequest, SourceApprovalStore
 from .audit import AuditLogger
-from .config import DEFAULT_PROFILE, BridgewardenConfig, POLICY_VERSION
+from .config import (
+    DEFAULT_CONFIG,
+    DEFAULT_PROFILE,
+    BridgewardenConfig,
+    POLICY_VERSION,
+    normalize_host,
+)
 from .pipeline import guard_text
 from .types import GuardResult
 from .quarantine import QuarantineStore
 
 
+_DNS_TTL_SECONDS = 60.0
+_DNS_CACHE_MAX_ENTRIES = 1024
+_DNS_CACHE: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+_DNS_CACHE_LOCK = threading.Lock()
+_KNOWN_FORGES = frozenset({"github.com", "gitlab.com", "bitbucket.org"})
+_RAW_FILE_MARKERS = frozenset({"blob", "raw"})
+
+
 class ToolError(Exception):
     """Raised for local tool handling errors."""
 
@@ -82,8 +101,7 @@ def _domain_allowed(config: Optional[BridgewardenConfig], domain: str) -> bool:
 
     if not config:
         return False
-    normalized = _normalize_host(domain)
-    return normalized in {_normalize_host(item) for item in config.approval_policy.allowed_web_domains}
+    return normalize_host(domain) in config.approval_policy._normalized_web_domains
 
 
 def _repo_allowed(config: Optional[BridgewardenConfig], url: str) -> bool:
@@ -116,67 +134,112 @@ def _host_allowed(config: Optional[BridgewardenConfig], host: str, kind: str) ->
     if not config:
         return False
     if kind == "web":
-        allowlist = config.network.allowed_web_hosts
+        allowlist = config.network._normalized_web_hosts
     else:
-        allowlist = config.network.allowed_repo_hosts
+        allowlist = config.network._normalized_repo_hosts
     if not allowlist:
         return False
-    normalized = _normalize_host(host)
-    return normalized in {_normalize_host(item) for item in allowlist}
+    return normalize_host(host) in allowlist
+
+
+def _github_raw_url(parsed: ParseResult, parts: List[str]) -> Optional[ParseResult]:
+    """Rewrite github.com blob/raw paths to raw.githubusercontent.com."""
+
+    if len(parts) < 5:
+        return None
+    org, repo, _, ref = parts[:4]
+    tail = "/".join(parts[4:])
+    return ParseResult(
+        scheme=parsed.scheme or "https",
+        netloc="raw.githubusercontent.com",
+        path=f"/{org}/{repo}/{ref}/{tail}",
+        params="",
+        query="",
+        fragment="",
+    )
+
+
+def _bitbucket_raw_url(parsed: ParseResult, parts: List[str]) -> Optional[ParseResult]:
+    """Rewrite bitbucket.org src/raw paths to the raw endpoint."""
+
+    new_path = "/" + "/".join([parts[0], parts[1], "raw", *parts[3:]])
+    return parsed._replace(path=new_path, query="", fragment="")
 
 
-def _normalize_host(host: str) -> str:
-    """Normalize a hostname for comparisons."""
+_ForgeHandlers = Dict[
+    Tuple[str, str], Callable[[ParseResult, List[str]], Optional[ParseResult]]
+]
+# Keyed by (host, third path segment) for forges with fixed-position markers. GitHub
+# rewrites win over the GitLab "/-/" scan; Bitbucket rewrites only apply after it.
+_FORGE_PATH_HANDLERS: _ForgeHandlers = {
+    ("github.com", "blob"): _github_raw_url,
+    ("github.com", "raw"): _github_raw_url,
+}
+_FORGE_FALLBACK_HANDLERS: _ForgeHandlers = {
+    ("bitbucket.org", "src"): _bitbucket_raw_url,
+    ("bitbucket.org", "raw"): _bitbucket_raw_url,
+}
 
-    return host.strip().lower().rstrip(".")
 
+def _forge_raw_url(
+    handlers: _ForgeHandlers, host: str, parsed: ParseResult, parts: List[str]
+) -> Optional[ParseResult]:
+    """Apply the fixed-position forge rewrite registered for this host and path."""
 
-def _normalize_raw_file_url(url: str) -> str:
-    """Normalize common raw file URLs to avoid cross-host redirects."""
+    if len(parts) < 4:
+        return None
+    handler = handlers.get((host, parts[2]))
+    if handler is None:
+        return None
+    return handler(parsed, parts)
+
+
+def _normalize_raw_file_url(url: str) -> Tuple[str, ParseResult]:
+    """Normalize common raw file URLs and return the URL with its parsed form."""
 
     parsed = urlparse(url)
-    host = _normalize_host(parsed.hostname or "")
+    host = normalize_host(parsed.hostname or "")
     path = parsed.path or ""
-    scheme = parsed.scheme or "https"
-
-    if host == "github.com":
-        parts = [part for part in path.split("/") if part]
-        if len(parts) >= 5 and parts[2] in {"blob", "raw"}:
-            org, repo, _, ref = parts[:4]
-            tail = "/".join(parts[4:])
-            if tail:
-                return f"{scheme}://raw.githubusercontent.com/{org}/{repo}/{ref}/{tail}"
+    # GitLab-style "/-/blob/" paths are also rewritten on self-hosted instances.
+    if host not in _KNOWN_FORGES and "/-/" not in path:
+        return url, parsed
 
     parts = [part for part in path.split("/") if part]
-    for idx in range(len(parts) - 2):
-        if parts[idx] == "-" and parts[idx + 1] in {"blob", "raw"}:
-            if idx >= 2 and idx + 2 < len(parts):
-                ref = parts[idx + 2]
-                tail = "/".join(parts[idx + 3 :])
-                new_path = "/" + "/".join(parts[:idx]) + "/-/raw/" + ref
-                if tail:
-                    new_path += "/" + tail
-                return parsed._replace(path=new_path, query="", fragment="").geturl()
-
-    if host == "bitbucket.org":
-        if len(parts) >= 4 and parts[2] in {"src", "raw"}:
-            ref = parts[3]
-            tail = "/".join(parts[4:])
-            new_path = f"/{parts[0]}/{parts[1]}/raw/{ref}"
-            if tail:
-                new_path += f"/{tail}"
-            return parsed._replace(path=new_path, query="", fragment="").geturl()
-
-    return url
+    normalized = _forge_raw_url(_FORGE_PATH_HANDLERS, host, parsed, parts)
+    if normalized is not None:
+        return normalized.geturl(), normalized
+
+    for idx in range(2, len(parts) - 2):
+        if parts[idx] == "-" and parts[idx + 1] in _RAW_FILE_MARKERS:
+            new_path = "/" + "/".join([*parts[:idx], "-", "raw", *parts[idx + 2 :]])
+            normalized = parsed._replace(path=new_path, query="", fragment="")
+            return normalized.geturl(), normalized
+
+    normalized = _forge_raw_url(_FORGE_FALLBACK_HANDLERS, host, parsed, parts)
+    if normalized is not None:
+        return normalized.geturl(), normalized
+    return url, parsed
+
+
+@lru_cache(maxsize=64)
+def _resolved_base(base_dir: str) -> str:
+    """Resolve an absolute base directory once per process."""
+
+    return os.path.realpath(base_dir)
 
 
 def _safe_path(base_dir: Path, path: str) -> Path:
     """Resolve a path and prevent traversal outside the base directory."""
 
-    base = base_dir.resolve()
-    candidate = (base_dir / path).resolve()
-    if base == candidate or base in candidate.parents:
-        return candidate
+    base_str = os.path.abspath(base_dir)
+    base = _resolved_base(base_str)
+    candidate = os.path.realpath(os.path.join(base_str, path))
+    try:
+        contained = os.path.commonpath([base, candidate]) == base
+    except ValueError:
+        contained = False
+    if contained:
+        return Path(candidate)
     raise ToolError("path escapes base directory")
 
 
@@ -209,7 +272,16 @@ def bw_read_file(
     if mode not in {"safe", "raw"}:
         return _blocked_result("INVALID_MODE", {"kind": "file", "path": path})
 
-    content = resolved.read_bytes().decode("utf-8", errors="replace")
+    limit = (config or DEFAULT_CONFIG).files.max_bytes
+    if resolved.stat().st_size > limit:
+        return _blocked_result("FILE_TOO_LARGE", {"kind": "file", "path": path})
+
+    # newline="" keeps CR/CRLF as-is so content_hash covers the original bytes' text.
+    with resolved.open("r", encoding="utf-8", errors="replace", newline="") as handle:
+        content = handle.read(limit + 1)
+    # The file may have grown since stat(); a decoded char is at least one byte.
+    if len(content) > limit:
+        return _blocked_result("FILE_TOO_LARGE", {"kind": "file", "path": path})
     return guard_text(
         content,
         source={"kind": "file", "path": str(resolved)},
@@ -228,7 +300,7 @@ def _is_ssrf_risk(
 
     if not hostname:
         return True
-    normalized = _normalize_host(hostname)
+    normalized = normalize_host(hostname)
     if normalized in {"localhost", "127.0.0.1", "::1"}:
         return not allow_localhost
     try:
@@ -240,7 +312,7 @@ def _is_ssrf_risk(
         resolved = _resolve_ips(normalized, resolver)
         if not resolved:
             return True
-        for ip in resolved:
+        for ip in dict.fromkeys(resolved):
             try:
                 parsed_ip = ipaddress.ip_address(ip)
             except ValueError:
@@ -253,34 +325,116 @@ def _is_ssrf_risk(
 
 
 def _resolve_ips(hostname: str, resolver: Optional[Callable[[str], List[str]]]) -> List[str]:
-    """Resolve hostnames to IPs using DNS or a provided resolver."""
+    """Resolve hostnames to IPs using a provided resolver or cached DNS lookups."""
 
     if resolver is not None:
         return resolver(hostname)
+    now = time.monotonic()
+    with _DNS_CACHE_LOCK:
+        cached = _DNS_CACHE.get(hostname)
+        if cached is not None and now - cached[0] < _DNS_TTL_SECONDS:
+            return list(cached[1])
     try:
-        infos = socket.getaddrinfo(hostname, None)
+        infos = socket.getaddrinfo(hostname, None, type=socket.SOCK_STREAM)
     except socket.gaierror:
         return []
-    ips: List[str] = []
-    for family, _, _, _, sockaddr in infos:
-        if family == socket.AF_INET:
-            ips.append(sockaddr[0])
-        elif family == socket.AF_INET6:
-            ips.append(sockaddr[0])
-    return ips
+    ips = list(
+        dict.fromkeys(
+            sockaddr[0]
+            for family, _, _, _, sockaddr in infos
+            if family in (socket.AF_INET, socket.AF_INET6)
+        )
+    )
+    with _DNS_CACHE_LOCK:
+        _DNS_CACHE[hostname] = (now, ips)
+        _DNS_CACHE.move_to_end(hostname)
+        while len(_DNS_CACHE) > _DNS_CACHE_MAX_ENTRIES:
+            _DNS_CACHE.popitem(last=False)
+    return list(ips)
+
+
+_Span = Tuple[int, int]
+
+
+def _network_spans(networks: Iterable[ipaddress._BaseNetwork]) -> List[_Span]:
+    """Convert networks to sorted inclusive (first, last) integer spans."""
+
+    return sorted((int(net.network_address), int(net.broadcast_address)) for net in networks)
+
+
+def _merge_spans(spans: Iterable[_Span]) -> List[_Span]:
+    """Merge overlapping or adjacent spans."""
+
+    merged: List[_Span] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract_spans(spans: List[_Span], holes: List[_Span]) -> List[_Span]:
+    """Remove the hole spans from a merged span list."""
+
+    result: List[_Span] = []
+    for start, end in spans:
+        for hole_start, hole_end in holes:
+            if hole_end < start or hole_start > end:
+                continue
+            if hole_start > start:
+                result.append((start, hole_start - 1))
+            start = max(start, hole_end + 1)
+        if start <= end:
+            result.append((start, end))
+    return result
+
+
+def _blocked_range_table(
+    constants: type, loopback: ipaddress._BaseNetwork, unspecified: ipaddress._BaseNetwork
+) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Build start/end tables mirroring the is_private/reserved/... address properties."""
+
+    # Read the ipaddress module's own networks so the table follows stdlib updates.
+    private = _subtract_spans(
+        _merge_spans(_network_spans(constants._private_networks)),
+        _network_spans(getattr(constants, "_private_networks_exceptions", ())),
+    )
+    reserved = getattr(constants, "_reserved_networks", None) or [constants._reserved_network]
+    other = _network_spans(
+        [
+            *reserved,
+            constants._multicast_network,
+            constants._linklocal_network,
+            loopback,
+            unspecified,
+        ]
+    )
+    spans = _merge_spans(private + other)
+    return tuple(start for start, _ in spans), tuple(end for _, end in spans)
+
+
+_BLOCKED_IP_RANGES = {
+    4: _blocked_range_table(
+        ipaddress._IPv4Constants,
+        ipaddress._IPv4Constants._loopback_network,
+        ipaddress.ip_network(ipaddress._IPv4Constants._unspecified_address),
+    ),
+    6: _blocked_range_table(
+        ipaddress._IPv6Constants,
+        ipaddress.IPv6Network("::1/128"),
+        ipaddress.IPv6Network("::/128"),
+    ),
+}
 
 
 def _is_private_ip(ip: ipaddress._BaseAddress) -> bool:
     """Classify IPs that should be blocked for SSRF protection."""
 
-    return (
-        ip.is_private
-        or ip.is_loopback
-        or ip.is_link_local
-        or ip.is_reserved
-        or ip.is_multicast
-        or ip.is_unspecified
-    )
+    starts, ends = _BLOCKED_IP_RANGES[ip.version]
+    value = int(ip)
+    idx = bisect_right(starts, value) - 1
+    return idx >= 0 and value <= ends[idx]
 
 
 def bw_web_fetch(
@@ -297,10 +451,13 @@ def bw_web_fetch(
 ) -> GuardResult:
     """Fetch web content via a configured fetcher and guard it."""
 
+    if not _network_enabled(config):
+        # Every request is rejected, so skip URL parsing entirely.
+        return _blocked_result("NETWORK_DISABLED", {"kind": "web", "url": url})
+
     original_url = url
-    url = _normalize_raw_file_url(url)
-    parsed = urlparse(url)
-    domain = _normalize_host(parsed.hostname or "")
+    url, parsed = _normalize_raw_file_url(url)
+    domain = normalize_host(parsed.hostname or "")
     source = {"kind": "web", "url": original_url, "domain": domain}
     if url != original_url:
         source["resolved_url"] = url
@@ -308,9 +465,6 @@ def bw_web_fetch(
     if parsed.scheme not in {"http", "https"}:
         return _blocked_result("UNSUPPORTED_URL_SCHEME", source)
 
-    if not _network_enabled(config):
-        return _blocked_result("NETWORK_DISABLED", source)
-
     if not _host_allowed(config, source["domain"], "web"):
         return _blocked_result("NETWORK_HOST_BLOCKED", source)
 
@@ -345,7 +499,7 @@ def bw_web_fetch(
         return _blocked_result("INVALID_MAX_BYTES", source)
 
     if max_bytes is None:
-        limit = config.network.web_max_bytes if config else 1024 * 1024
+        limit = (config or DEFAULT_CONFIG).network.web_max_bytes
     else:
         limit = max_bytes
     if config is not None:
@@ -378,8 +532,8 @@ def bw_fetch_repo(
 
     source = {"kind": "repo", "url": url}
     parsed = urlparse(url)
-    host = _normalize_host(parsed.hostname or "")
-    archive_host = _repo_archive_host(url)
+    host = normalize_host(parsed.hostname or "")
+    archive_host = _repo_archive_host(host)
 
     if not _network_enabled(config):
         return _blocked_repo_response(source, "NETWORK_DISABLED")
@@ -419,11 +573,9 @@ def bw_fetch_repo(
         return _blocked_repo_response(source, "REPO_FETCH_FAILED")
 
 
-def _repo_archive_host(url: str) -> Optional[str]:
-    """Return the archive host used for repo fetches."""
+def _repo_archive_host(host: str) -> Optional[str]:
+    """Return the archive host used for repo fetches from a normalized host."""
 
-    parsed = urlparse(url)
-    host = _normalize_host(parsed.hostname or "")
     if host == "github.com":
         return "codeload.github.com"
     return host or None
@@ -451,13 +603,13 @@ def bw_request_source_approval(
     """Create a new source approval request."""
 
     status = store.request(SourceApprovalRequest(**request))
-    return asdict(status)
+    return status.to_dict()
 
 
 def bw_get_source_approval(store: SourceApprovalStore, approval_id: str) -> Dict[str, object]:
     """Fetch a single source approval record."""
 
-    return asdict(store.get(approval_id))
+    return store.get(approval_id).to_dict()
 
 
 def bw_list_source_approvals(
@@ -469,7 +621,7 @@ def bw_list_source_approvals(
     """List source approvals with optional filters."""
 
     approvals = store.list(status=status, kind=kind, limit=limit)
-    return {"approvals": [asdict(approval) for approval in approvals]}
+    return {"approvals": [approval.to_dict() for approval in approvals]}
 
 
 def bw_decide_source_approval(
@@ -482,4 +634,4 @@ def bw_decide_source_approval(
     """Approve or deny a pending source approval request."""
 
     status = store.decide(approval_id, decision, notes=notes, decided_by=decided_by)
-    return asdict(status)
+    return status.to_dict()
@@ -1,10 +1,14 @@
 """Shared data types for tool responses."""
 
 from dataclasses import dataclass
+import sys
 from typing import Dict, List, Optional
 
+# dataclass(slots=True) needs Python 3.10; older interpreters keep __dict__.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, **_SLOTS)
 class GuardResult:
     """Standard guard result payload for MCP tools."""
 
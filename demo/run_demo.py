@@ -42,7 +42,7 @@ def _build_tarball(files: Dict[str, bytes]) -> bytes:
     """Create a gzip tarball from a mapping of file names to payloads."""
 
     buffer = io.BytesIO()
-    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+    with tarfile.open(fileobj=buffer, mode="w|gz") as archive:
         for name, payload in files.items():
             info = tarfile.TarInfo(name)
             info.size = len(payload)
@@ -5,21 +5,29 @@ import errno
 from functools import partial
 from http.server import SimpleHTTPRequestHandler
 from pathlib import Path
+import socket
 import socketserver
 
 
-class _ReusableTCPServer(socketserver.TCPServer):
-    """TCP server with address reuse for quick restarts."""
+class _ReusableTCPServer(socketserver.ThreadingTCPServer):
+    """Threaded TCP server with address reuse for quick restarts."""
 
     allow_reuse_address = True
+    daemon_threads = True
 
 
 class _DemoRequestHandler(SimpleHTTPRequestHandler):
-    """Request handler that ignores client disconnects."""
+    """Request handler that sends files zero-copy and ignores client disconnects."""
+
+    def setup(self) -> None:
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
     def copyfile(self, source, outputfile) -> None:
         try:
-            super().copyfile(source, outputfile)
+            outputfile.flush()
+            # Falls back to plain sends for in-memory bodies such as directory listings.
+            self.connection.sendfile(source)
         except (BrokenPipeError, ConnectionResetError):
             return
         except OSError as exc:
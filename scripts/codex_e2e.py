@@ -4,38 +4,43 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import json
 import os
 from pathlib import Path
 import socket
 import subprocess
 import sys
+import threading
 import time
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from bridgewarden.e2e import extract_guard_results  # noqa: E402
-
 
 def _load_cases(path: Path) -> List[Dict[str, Any]]:
-    data = json.loads(path.read_text(encoding="utf-8"))
+    # json.loads detects UTF-8 from bytes, so the text decode is left to the parser.
+    data = json.loads(path.read_bytes())
     if isinstance(data, dict) and "cases" in data:
         cases = data["cases"]
     else:
         cases = data
     if not isinstance(cases, list):
         raise ValueError("cases must be a list")
+    # Validated once here so the report loop only does a membership check.
+    for case in cases:
+        case["expected_decision"] = _expected_decisions(case["expected_decision"])
     return cases
 
 
-def _expected_decisions(value: object) -> List[str]:
+def _expected_decisions(value: object) -> Tuple[str, ...]:
     if isinstance(value, str):
-        return [value]
+        return (value,)
     if isinstance(value, list) and all(isinstance(item, str) for item in value):
-        return value
+        return tuple(value)
     raise ValueError("expected_decision must be a string or list of strings")
 
 
@@ -44,6 +49,7 @@ def _run_codex(
     codex_bin: str,
     repo_root: Path,
     extra_args: Sequence[str],
+    on_line: Callable[[str], None],
 ) -> subprocess.CompletedProcess[str]:
     cmd = [
         codex_bin,
@@ -54,11 +60,41 @@ def _run_codex(
         str(repo_root),
         *extra_args,
     ]
-    return subprocess.run(
+    process = subprocess.Popen(
         cmd,
-        input=prompt,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
-        capture_output=True,
+        bufsize=1,
+    )
+    stderr_chunks: List[str] = []
+    drain = threading.Thread(
+        target=lambda: stderr_chunks.append(process.stderr.read()),
+        daemon=True,
+    )
+    drain.start()
+
+    def _feed_stdin() -> None:
+        try:
+            process.stdin.write(prompt)
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+
+    # Feed the prompt from its own thread so a full stdout pipe cannot deadlock us.
+    feeder = threading.Thread(target=_feed_stdin, daemon=True)
+    feeder.start()
+    # The full stdout is kept because failing cases dump and print it.
+    stdout_lines: List[str] = []
+    for line in process.stdout:
+        stdout_lines.append(line)
+        on_line(line)
+    returncode = process.wait()
+    feeder.join()
+    drain.join()
+    return subprocess.CompletedProcess(
+        cmd, returncode, "".join(stdout_lines), "".join(stderr_chunks)
     )
 
 
@@ -87,15 +123,24 @@ def _run_case(
     prompt = case["prompt"]
     if isinstance(prompt, str) and demo_port is not None:
         prompt = prompt.replace("{DEMO_PORT}", str(demo_port))
-    result = _run_codex(prompt, codex_bin, repo_root, extra_args)
-    stdout_lines = result.stdout.splitlines()
-    guard_results = extract_guard_results(stdout_lines)
+    # Imported here so --help and argument errors skip loading the bridgewarden package.
+    from bridgewarden.e2e import extract_guard_results
+
+    # Cases are judged on the final GuardResult, so earlier ones are dropped as they stream.
+    latest: List[Dict[str, Any]] = []
+
+    def _keep_latest(line: str) -> None:
+        found = extract_guard_results((line,))
+        if found:
+            latest[:] = found[-1:]
+
+    result = _run_codex(prompt, codex_bin, repo_root, extra_args, on_line=_keep_latest)
     return {
         "case": case,
         "exit_code": result.returncode,
         "stdout": result.stdout,
         "stderr": result.stderr,
-        "guard_results": guard_results,
+        "guard_result": latest[-1] if latest else None,
     }
 
 
@@ -108,13 +153,16 @@ def _print_ok(message: str) -> None:
 
 
 def _wait_for_port(host: str, port: int, timeout: float = 5.0) -> bool:
-    deadline = time.time() + timeout
-    while time.time() < deadline:
+    deadline = time.monotonic() + timeout
+    # Refused localhost connects fail immediately, so poll fast and back off gently.
+    delay = 0.005
+    while time.monotonic() < deadline:
         try:
-            with socket.create_connection((host, port), timeout=0.5):
+            with socket.create_connection((host, port), timeout=0.05):
                 return True
         except OSError:
-            time.sleep(0.1)
+            time.sleep(delay)
+            delay = min(delay * 2, 0.05)
     return False
 
 
@@ -162,6 +210,11 @@ def main() -> int:
         action="store_true",
         help="Start the local demo webapp for network cases.",
     )
+    parser.add_argument(
+        "--reuse-demo-server",
+        action="store_true",
+        help="With --start-demo-server, reuse a webapp already listening on --demo-port.",
+    )
     parser.add_argument(
         "--demo-port",
         type=int,
@@ -196,6 +249,12 @@ def main() -> int:
         default=Path("demo/e2e_outputs"),
         help="Directory to dump raw stdout/stderr on failures.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of cases to run concurrently.",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -220,7 +279,13 @@ def main() -> int:
     demo_process: Optional[subprocess.Popen[str]] = None
     try:
         if args.start_demo_server:
-            demo_process = _start_demo_server(repo_root, args.demo_port)
+            if args.reuse_demo_server and _wait_for_port(
+                "127.0.0.1", args.demo_port, timeout=0.2
+            ):
+                # Left running for the next invocation, so nothing to terminate here.
+                print(f"[NOTE] reusing demo webapp on port {args.demo_port}")
+            else:
+                demo_process = _start_demo_server(repo_root, args.demo_port)
 
         if args.include_network and not args.install:
             print(
@@ -245,44 +310,62 @@ def main() -> int:
         if not output_dir.is_absolute():
             output_dir = repo_root / output_dir
         output_dir.mkdir(parents=True, exist_ok=True)
-        for case in selected_cases:
-            name = case.get("name", "<unnamed>")
-            run = _run_case(case, args.codex_bin, repo_root, args.extra_arg, args.demo_port)
-            if run["exit_code"] != 0:
-                failures += 1
-                _print_failure(f"{name}: codex exec failed ({run['exit_code']})")
-                if args.debug:
-                    _print_failure(run["stderr"].strip() or "<no stderr>")
-                continue
-            guard_results = run["guard_results"]
-            if not guard_results:
-                failures += 1
-                _print_failure(f"{name}: no GuardResult found in output")
-                _dump_output(output_dir, name, run["stdout"], run["stderr"])
-                if args.debug:
-                    _print_failure(run["stderr"].strip() or "<no stderr>")
-                    _print_failure(run["stdout"].strip() or "<no stdout>")
-                continue
-            result = guard_results[-1]
-            expected = _expected_decisions(case["expected_decision"])
-            if result.get("decision") not in expected:
-                failures += 1
-                _print_failure(
-                    f"{name}: decision {result.get('decision')} not in {expected}"
-                )
-                continue
-            expected_reasons = case.get("expected_reasons", [])
-            if expected_reasons:
-                missing = sorted(
-                    reason
-                    for reason in expected_reasons
-                    if reason not in result.get("reasons", [])
-                )
-                if missing:
+        jobs = max(1, min(args.jobs, len(selected_cases)))
+        run_case = partial(
+            _run_case,
+            codex_bin=args.codex_bin,
+            repo_root=repo_root,
+            extra_args=args.extra_arg,
+            demo_port=args.demo_port,
+        )
+        dumps = []
+        with ThreadPoolExecutor(max_workers=jobs) as executor, ThreadPoolExecutor(
+            max_workers=2
+        ) as dump_pool:
+            # Results are consumed in case order, so reporting stays on this thread.
+            for case, run in zip(selected_cases, executor.map(run_case, selected_cases)):
+                name = case.get("name", "<unnamed>")
+                if run["exit_code"] != 0:
+                    failures += 1
+                    _print_failure(f"{name}: codex exec failed ({run['exit_code']})")
+                    if args.debug:
+                        _print_failure(run["stderr"].strip() or "<no stderr>")
+                    continue
+                result = run["guard_result"]
+                if result is None:
+                    failures += 1
+                    _print_failure(f"{name}: no GuardResult found in output")
+                    dumps.append(
+                        dump_pool.submit(
+                            _dump_output, output_dir, name, run["stdout"], run["stderr"]
+                        )
+                    )
+                    if args.debug:
+                        _print_failure(run["stderr"].strip() or "<no stderr>")
+                        _print_failure(run["stdout"].strip() or "<no stdout>")
+                    continue
+                expected = case["expected_decision"]
+                if result.get("decision") not in expected:
                     failures += 1
-                    _print_failure(f"{name}: missing reasons {missing}")
+                    _print_failure(
+                        f"{name}: decision {result.get('decision')} not in {list(expected)}"
+                    )
                     continue
-            _print_ok(name)
+                expected_reasons = case.get("expected_reasons", [])
+                if expected_reasons:
+                    missing = sorted(
+                        reason
+                        for reason in expected_reasons
+                        if reason not in result.get("reasons", [])
+                    )
+                    if missing:
+                        failures += 1
+                        _print_failure(f"{name}: missing reasons {missing}")
+                        continue
+                _print_ok(name)
+        for dump in dumps:
+            # Surfaces any write error from the dump threads.
+            dump.result()
 
         if failures:
             _print_failure(f"{failures} case(s) failed.")
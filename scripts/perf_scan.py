@@ -4,11 +4,14 @@
 from __future__ import annotations
 
 import argparse
+import json
+from pathlib import Path
 import random
+import statistics
 import time
 from typing import Dict, Iterable, List
 
-from bridgewarden.pipeline import guard_text
+from bridgewarden.pipeline import PreparedText, guard_text, prepare_text
 
 
 _BENIGN_SENTENCES = [
@@ -29,28 +32,35 @@ _INJECTION_SNIPPETS = [
 
 
 def _build_text(target_bytes: int, inject_every: int) -> str:
+    # Upper bound on the snippets needed, so sampling happens in two batched calls.
+    shortest = min(len(snippet) for snippet in _BENIGN_SENTENCES + _INJECTION_SNIPPETS)
+    limit = target_bytes // shortest + 1
+    benign = iter(random.choices(_BENIGN_SENTENCES, k=limit))
+    injected = iter(random.choices(_INJECTION_SNIPPETS, k=limit // max(inject_every, 1) + 1))
     chunks: List[str] = []
+    total = 0
     i = 0
-    while sum(len(c) for c in chunks) < target_bytes:
+    while total < target_bytes:
         if inject_every and i % inject_every == 0:
-            chunks.append(random.choice(_INJECTION_SNIPPETS))
+            snippet = next(injected)
         else:
-            chunks.append(random.choice(_BENIGN_SENTENCES))
+            snippet = next(benign)
+        chunks.append(snippet)
+        total += len(snippet)
         i += 1
     return " ".join(chunks)
 
 
-def _run_case(text: str, profile: str, runs: int) -> Dict[str, float]:
+def _run_case(text: str, prepared: PreparedText, profile: str, runs: int) -> Dict[str, float]:
     durations: List[float] = []
     for _ in range(runs):
         start = time.perf_counter()
-        guard_text(text, profile_name=profile)
+        guard_text(text, profile_name=profile, prepared=prepared)
         durations.append(time.perf_counter() - start)
-    durations.sort()
     return {
-        "min_ms": durations[0] * 1000.0,
-        "p50_ms": durations[len(durations) // 2] * 1000.0,
-        "max_ms": durations[-1] * 1000.0,
+        "min_ms": min(durations) * 1000.0,
+        "p50_ms": statistics.median(durations) * 1000.0,
+        "max_ms": max(durations) * 1000.0,
     }
 
 
@@ -75,10 +85,14 @@ def main() -> int:
     for size in args.sizes:
         text = _build_text(size, args.inject_every)
         print(f"\nsize={size} bytes")
+        # Normalize/sanitize/redact/hash do not depend on the profile; time them once.
+        start = time.perf_counter()
+        prepared = prepare_text(text)
+        print(f"  shared stages={(time.perf_counter() - start) * 1000.0:.2f}ms")
         size_key = str(size)
         results[size_key] = {}
         for profile in profiles:
-            stats = _run_case(text, profile, args.runs)
+            stats = _run_case(text, prepared, profile, args.runs)
             results[size_key][profile] = stats
             print(
                 f"  profile={profile} min={stats['min_ms']:.2f}ms "
@@ -86,18 +100,13 @@ def main() -> int:
             )
     if args.output:
         output_path = args.output
-        with open(output_path, "w", encoding="utf-8") as handle:
-            json.dump(
-                {
-                    "sizes": args.sizes,
-                    "runs": args.runs,
-                    "inject_every": args.inject_every,
-                    "results": results,
-                },
-                handle,
-                indent=2,
-                sort_keys=True,
-            )
+        payload = {
+            "sizes": args.sizes,
+            "runs": args.runs,
+            "inject_every": args.inject_every,
+            "results": results,
+        }
+        Path(output_path).write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
         print(f"\nWrote results to {output_path}")
     return 0
 
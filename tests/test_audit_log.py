@@ -21,3 +21,14 @@ class AuditLogWriterTests(unittest.TestCase):
             self.assertEqual(data["timestamp"], "2024-01-01T00:00:00+00:00")
             self.assertNotIn("sanitized_text", data)
             self.assertNotIn("original_text", data)
+
+    def test_audit_log_hands_lines_to_writer(self) -> None:
+        lines = []
+        logger = AuditLogger(writer=lines.append)
+        result = guard_text("hello", source={"kind": "fixture"})
+        logger.log(result, timestamp="2024-01-01T00:00:00+00:00")
+        logger.log(result, timestamp="2024-01-01T00:00:01+00:00")
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(all(line.endswith("\n") for line in lines))
+        self.assertEqual(json.loads(lines[1])["timestamp"], "2024-01-01T00:00:01+00:00")
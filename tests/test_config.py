@@ -1,11 +1,16 @@
 import json
 import tempfile
 from pathlib import Path
+from typing import Callable
 import unittest
 
 from bridgewarden.config import ApprovalPolicy, BridgewardenConfig, ConfigError, load_config
 
 
+def _dict_reader(data: dict) -> Callable[[Path], str]:
+    return lambda path: json.dumps(data)
+
+
 class ConfigTests(unittest.TestCase):
     def test_load_config_defaults_when_missing(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -32,25 +37,26 @@ class ConfigTests(unittest.TestCase):
                 "allowed_web_hosts": ["example.com"],
                 "allowed_repo_hosts": ["github.com"],
             },
+            "files": {"max_bytes": 300},
         }
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir) / "bridgewarden.yaml"
-            path.write_text(json.dumps(data), encoding="utf-8")
-            config = load_config(path)
-            self.assertEqual(config.profile, "strict")
-            self.assertEqual(config.approval_policy.allowed_web_domains, ["example.com"])
-            self.assertEqual(
-                config.approval_policy.allowed_repo_urls, ["https://github.com/org/repo"]
-            )
-            self.assertTrue(config.network.enabled)
-            self.assertTrue(config.network.allow_localhost)
-            self.assertEqual(config.network.web_max_bytes, 100)
-            self.assertEqual(config.network.allowed_repo_hosts, ["github.com"])
+        config = load_config(Path("bridgewarden.yaml"), reader=_dict_reader(data))
+        self.assertEqual(config.profile, "strict")
+        self.assertEqual(config.approval_policy.allowed_web_domains, ["example.com"])
+        self.assertEqual(
+            config.approval_policy.allowed_repo_urls, ["https://github.com/org/repo"]
+        )
+        self.assertTrue(config.network.enabled)
+        self.assertTrue(config.network.allow_localhost)
+        self.assertEqual(config.network.web_max_bytes, 100)
+        self.assertEqual(config.network.allowed_repo_hosts, ["github.com"])
+        self.assertEqual(config.files.max_bytes, 300)
 
     def test_load_config_rejects_invalid_types(self) -> None:
         bad = {"profile": 123, "approvals": "nope"}
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = Path(tmpdir) / "bridgewarden.yaml"
-            path.write_text(json.dumps(bad), encoding="utf-8")
-            with self.assertRaises(ConfigError):
-                load_config(path)
+        with self.assertRaises(ConfigError):
+            load_config(Path("bridgewarden.yaml"), reader=_dict_reader(bad))
+
+    def test_host_allowlists_are_prenormalized(self) -> None:
+        policy = ApprovalPolicy(allowed_web_domains=[" Docs.Example.com. "])
+        self.assertEqual(policy._normalized_web_domains, frozenset({"docs.example.com"}))
+        self.assertEqual(policy, ApprovalPolicy(allowed_web_domains=[" Docs.Example.com. "]))
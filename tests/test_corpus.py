@@ -1,5 +1,7 @@
 import json
+import os
 from pathlib import Path
+from typing import List, Tuple
 import unittest
 
 from bridgewarden.pipeline import guard_text
@@ -10,7 +12,7 @@ FIXTURES_DIR = Path("test-corpus/fixtures")
 def _load_expected(fixture: Path) -> dict:
     expected_path = fixture.with_name(fixture.name + ".expected.json")
     if expected_path.exists():
-        return json.loads(expected_path.read_text(encoding="utf-8"))
+        return json.loads(expected_path.read_bytes())
 
     name = fixture.name.lower()
     if "_allow_" in name:
@@ -24,16 +26,27 @@ def _load_expected(fixture: Path) -> dict:
     return {"expected_decision": decision, "expected_reasons": []}
 
 
+def _load_cases() -> List[Tuple[Path, dict, str]]:
+    with os.scandir(FIXTURES_DIR) as entries:
+        names = sorted(
+            entry.name
+            for entry in entries
+            if entry.is_file() and not entry.name.endswith(".expected.json")
+        )
+    fixtures = [FIXTURES_DIR / name for name in names]
+    return [(path, _load_expected(path), path.read_text(encoding="utf-8")) for path in fixtures]
+
+
 class CorpusRunnerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.cases = _load_cases()
+
     def test_fixtures_match_expectations(self) -> None:
-        fixtures = [path for path in sorted(FIXTURES_DIR.iterdir()) if path.is_file()]
-        fixture_files = [path for path in fixtures if not path.name.endswith(".expected.json")]
-        self.assertTrue(fixture_files, "No fixtures found under test-corpus/fixtures")
+        self.assertTrue(self.cases, "No fixtures found under test-corpus/fixtures")
 
-        for fixture in fixture_files:
+        for fixture, expected, content in self.cases:
             with self.subTest(fixture=fixture.name):
-                expected = _load_expected(fixture)
-                content = fixture.read_text(encoding="utf-8")
                 profile_name = expected.get("profile")
                 if profile_name:
                     result = guard_text(
@@ -1,12 +1,35 @@
 import json
 import tempfile
 from pathlib import Path
+import threading
 import unittest
 
 from bridgewarden.server import BridgewardenServer, build_tool_handlers, load_context
 
+_BALANCED_CONFIG_JSON = json.dumps({"profile": "balanced", "approvals": {}}).encode()
+
 
 class MCPServerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # One context for the class; tests only read through it.
+        cls._tmpdir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cls._tmpdir.cleanup)
+        tmp_path = Path(cls._tmpdir.name)
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        config_path = config_dir / "bridgewarden.yaml"
+        config_path.write_bytes(_BALANCED_CONFIG_JSON)
+        (tmp_path / "note.txt").write_bytes(b"hello")
+        context = load_context(
+            config_path=config_path,
+            data_dir=tmp_path / "data",
+            base_dir=tmp_path,
+        )
+        cls.handlers = build_tool_handlers(context)
+        # Shared by tests that only send stateless requests to an empty handler map.
+        cls.empty_server = BridgewardenServer({})
+
     def test_initialize(self) -> None:
         server = BridgewardenServer({})
         response = server.handle_request(
@@ -24,37 +47,22 @@ class MCPServerTests(unittest.TestCase):
         self.assertIn("tools", response["result"]["capabilities"])
 
     def test_handle_request_dispatches_tool(self) -> None:
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_path = Path(tmpdir)
-            config_dir = tmp_path / "config"
-            config_dir.mkdir()
-            config_path = config_dir / "bridgewarden.yaml"
-            config_path.write_text(json.dumps({"profile": "balanced", "approvals": {}}))
-            file_path = tmp_path / "note.txt"
-            file_path.write_text("hello", encoding="utf-8")
-
-            context = load_context(
-                config_path=config_path,
-                data_dir=tmp_path / "data",
-                base_dir=tmp_path,
-            )
-            server = BridgewardenServer(build_tool_handlers(context))
-            response = server.handle_request(
-                {
-                    "jsonrpc": "2.0",
-                    "id": "2",
-                    "method": "tools/call",
-                    "params": {"name": "bw_read_file", "arguments": {"path": "note.txt"}},
-                }
-            )
-            self.assertIn("result", response)
-            content = response["result"]["content"][0]["text"]
-            guard = json.loads(content)
-            self.assertEqual(guard["decision"], "ALLOW")
+        server = BridgewardenServer(self.handlers)
+        response = server.handle_request(
+            {
+                "jsonrpc": "2.0",
+                "id": "2",
+                "method": "tools/call",
+                "params": {"name": "bw_read_file", "arguments": {"path": "note.txt"}},
+            }
+        )
+        self.assertIn("result", response)
+        content = response["result"]["content"][0]["text"]
+        guard = json.loads(content)
+        self.assertEqual(guard["decision"], "ALLOW")
 
     def test_unknown_tool_returns_error_payload(self) -> None:
-        server = BridgewardenServer({})
-        response = server.handle_request(
+        response = self.empty_server.handle_request(
             {
                 "jsonrpc": "2.0",
                 "id": "3",
@@ -71,3 +79,131 @@ class MCPServerTests(unittest.TestCase):
         )
         tools = response["result"]["tools"]
         self.assertTrue(any(tool["name"] == "bw_read_file" for tool in tools))
+
+    def test_tool_definitions_are_built_lazily(self) -> None:
+        from bridgewarden import server as server_module
+
+        self.assertNotIn("TOOL_DEFINITIONS", vars(server_module))
+        definitions = server_module.TOOL_DEFINITIONS
+        self.assertIs(definitions, server_module.TOOL_DEFINITIONS)
+        self.assertIn("bw_read_file", definitions)
+
+    def test_envelope_rejects_non_object_params(self) -> None:
+        response = self.empty_server.handle_request(
+            {"jsonrpc": "2.0", "id": 5, "method": "tools/call", "params": ["bw_read_file"]}
+        )
+        self.assertEqual(response["error"]["code"], -32602)
+
+    def test_envelope_checks_method_before_params(self) -> None:
+        server = BridgewardenServer({})
+        response = server.handle_request(
+            {"jsonrpc": "2.0", "id": 5, "method": "tools/unknown", "params": []}
+        )
+        self.assertEqual(response["error"]["code"], -32601)
+
+    def test_envelope_keeps_notifications_silent(self) -> None:
+        server = BridgewardenServer({})
+        notifications = [
+            {"jsonrpc": "2.0", "method": "tools/call", "params": ["bw_read_file"]},
+            {"jsonrpc": "2.0", "method": "notifications/cancelled", "params": []},
+        ]
+        for request in notifications:
+            with self.subTest(method=request["method"]):
+                self.assertIsNone(server.handle_request(request))
+                self.assertIsNone(server.handle_request_json(request))
+
+    def test_envelope_keeps_baseline_tolerance(self) -> None:
+        for request_id in (True, {"nested": 1}):
+            with self.subTest(request_id=request_id):
+                response = self.empty_server.handle_request(
+                    {"jsonrpc": "2.0", "id": request_id, "method": "ping", "params": []}
+                )
+                self.assertEqual(response, {"jsonrpc": "2.0", "id": request_id, "result": {}})
+        request = {
+            "jsonrpc": "2.0",
+            "id": 7,
+            "method": "notifications/initialized",
+            "params": ["ignored"],
+        }
+        self.assertIsNone(BridgewardenServer({}).handle_request(request))
+
+    def test_handle_request_json_matches_dict_responses(self) -> None:
+        server = BridgewardenServer({"bw_read_file": lambda: None})
+        for method in ("ping", "tools/list"):
+            with self.subTest(method=method):
+                request = {"jsonrpc": "2.0", "id": 6, "method": method}
+                line = server.handle_request_json(request)
+                self.assertEqual(json.loads(line), server.handle_request(request))
+
+    def test_batch_tool_calls_preserve_order(self) -> None:
+        server = BridgewardenServer(
+            {"echo": lambda value: {"value": value}},
+            batch_workers=4,
+            parallel_tools=frozenset({"echo"}),
+        )
+        self.addCleanup(server.close)
+        entries = [
+            {
+                "jsonrpc": "2.0",
+                "id": index,
+                "method": "tools/call",
+                "params": {"name": "echo", "arguments": {"value": index}},
+            }
+            for index in range(6)
+        ]
+        entries.insert(3, {"jsonrpc": "2.0", "id": "p", "method": "ping"})
+        entries.append({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        responses = [json.loads(line) for line in server.handle_batch_json(entries)]
+        self.assertEqual([response["id"] for response in responses], [0, 1, 2, "p", 3, 4, 5])
+        payload = json.loads(responses[-1]["result"]["content"][0]["text"])
+        self.assertEqual(payload, {"value": 5})
+
+    def test_batch_reads_files_concurrently_with_intact_audit_log(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        tmp_path = Path(tmpdir.name)
+        for index in range(8):
+            (tmp_path / f"note{index}.txt").write_text(f"note {index} " * 50, encoding="utf-8")
+        context = load_context(
+            config_path=tmp_path / "missing.yaml", data_dir=tmp_path / "data", base_dir=tmp_path
+        )
+        server = BridgewardenServer(build_tool_handlers(context), batch_workers=4)
+        self.addCleanup(server.close)
+        entries = [
+            {
+                "jsonrpc": "2.0",
+                "id": index,
+                "method": "tools/call",
+                "params": {"name": "bw_read_file", "arguments": {"path": f"note{index}.txt"}},
+            }
+            for index in range(8)
+        ]
+        responses = [json.loads(line) for line in server.handle_batch_json(entries)]
+        self.assertEqual([response["id"] for response in responses], list(range(8)))
+        self.assertIsNotNone(server._executor)
+        lines = (tmp_path / "data" / "logs" / "audit.jsonl").read_text(encoding="utf-8")
+        paths = sorted(json.loads(line)["source"]["path"] for line in lines.splitlines())
+        self.assertEqual(paths, sorted(str(tmp_path / f"note{i}.txt") for i in range(8)))
+
+    def test_batch_runs_write_tools_inline(self) -> None:
+        threads = []
+        server = BridgewardenServer(
+            {"record": lambda: threads.append(threading.current_thread()) or {}}
+        )
+        self.addCleanup(server.close)
+        entries = [
+            {
+                "jsonrpc": "2.0",
+                "id": index,
+                "method": "tools/call",
+                "params": {"name": "record", "arguments": {}},
+            }
+            for index in range(3)
+        ]
+        responses = server.handle_batch_json(entries)
+        self.assertEqual(len(responses), 3)
+        self.assertEqual(threads, [threading.current_thread()] * 3)
+        self.assertIsNone(server._executor)
+
+    def test_server_uses_slots(self) -> None:
+        self.assertFalse(hasattr(self.empty_server, "__dict__"))
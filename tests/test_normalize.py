@@ -14,3 +14,8 @@ class NormalizeTests(unittest.TestCase):
         result = normalize_text(text)
         self.assertTrue(result.unicode_suspicious)
         self.assertEqual(result.text, "safe  text")
+
+    def test_short_texts_are_cached(self) -> None:
+        self.assertIs(normalize_text("abc"), normalize_text("abc"))
+        long_text = "a" * 5000
+        self.assertEqual(normalize_text(long_text), normalize_text(long_text))